@@ -2,6 +2,8 @@ import os
 
 from openai import OpenAI
 
+from config.settings import TTS_MODEL
+
 from util.decorator import log_exceptions_from_self_logger
 
 
@@ -26,12 +28,12 @@ class PhraseGenerator:
         file_name = f"tts_{category}_{index}.{file_format}"
         file_path = os.path.join(category_dir, file_name)
 
-        response = self.openai.audio.speech.create(
-            model="tts-1", voice=self.voice, input=text
-        )
-
-        with open(file_path, "wb") as file:
-            file.write(response.content)
+        # Direkt in die Datei streamen, ohne die komplette Antwort als
+        # bytes-Objekt im Speicher zu halten
+        with self.openai.audio.speech.with_streaming_response.create(
+            model=TTS_MODEL, voice=self.voice, input=text, response_format=file_format
+        ) as response:
+            response.stream_to_file(file_path)
 
         print(f"✅ Sprachdatei gespeichert: {file_path}")
         return file_path
@@ -3,7 +3,7 @@ import threading
 import time
 import traceback
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 
 from singleton_decorator import singleton
 
@@ -135,8 +135,9 @@ class AudioManager(LoggingMixin):
             with self._lock:
                 self.sound_map[sound_id] = sound_info
 
-            self.logger.info(
-                f"✅ MP3-Sound '{sound_id}' erfolgreich registriert: {file_path}"
+            # Wird pro TTS-Datei aufgerufen und gehört daher auf DEBUG
+            self.logger.debug(
+                "✅ MP3-Sound '%s' erfolgreich registriert: %s", sound_id, file_path
             )
             return True
 
@@ -178,6 +179,24 @@ class AudioManager(LoggingMixin):
             ).start()
             return True
 
+    def preload(self, sound_ids: Iterable[str]) -> None:
+        """
+        Bereitet häufig genutzte Sounds (z. B. Feedback-Töne) vorab in der
+        Strategie vor, damit deren erste Wiedergabe nicht erst dekodieren muss.
+        """
+        for sound_id in sound_ids:
+            with self._lock:
+                sound_info = self.sound_map.get(sound_id)
+
+            if sound_info is None:
+                self.logger.info(f"❌ Sound '{sound_id}' nicht gefunden")
+                continue
+
+            try:
+                self.strategy.preload(sound_info.path)
+            except Exception as e:
+                self.logger.info(f"❌ Fehler beim Vorladen von '{sound_id}': {e}")
+
     def is_playing(self) -> bool:
         """Prüft, ob aktuell ein Sound abgespielt wird."""
         return self.strategy.is_playing()
@@ -201,19 +220,18 @@ class AudioManager(LoggingMixin):
 
     def _loop_sound(self, sound_id: str, duration: float):
         """Interne Methode zum Loopen eines Sounds für eine bestimmte Dauer."""
-        start_time = time.time()
-        end_time = start_time + duration
+        end_time = time.monotonic() + duration
 
         self.logger.info(f"🔄 Loop gestartet für '{sound_id}' ({duration} Sekunden)")
 
         try:
-            while time.time() < end_time and not self._stop_loop:
+            while time.monotonic() < end_time and not self._stop_loop:
                 self._play_sound(sound_id)
 
                 if self._stop_loop:
                     break
 
-                if time.time() >= end_time:
+                if time.monotonic() >= end_time:
                     break
         except Exception as e:
             self.logger.info(f"❌ Fehler beim Loopen von '{sound_id}': {e}")
@@ -246,13 +264,21 @@ class AudioManager(LoggingMixin):
 
     def _play_sound(self, sound_id: str) -> bool:
         """Interne Methode zum Abspielen eines Sounds."""
+        # Der Lock schützt nur den Zugriff auf die sound_map. Die blockierende
+        # Wiedergabe läuft ohne ihn, sonst warten register_sound aus den
+        # TTS-Threads und das Cleanup auf das Ende jedes Sounds.
         with self._lock:
-            try:
-                sound_info = self.sound_map[sound_id]
-                return self.strategy.play_sound(sound_info)
-            except Exception as e:
-                self.logger.info(f"❌ Fehler beim Abspielen von '{sound_id}': {e}")
-                return False
+            sound_info = self.sound_map.get(sound_id)
+
+        if sound_info is None:
+            self.logger.info(f"❌ Sound '{sound_id}' nicht gefunden")
+            return False
+
+        try:
+            return self.strategy.play_sound(sound_info)
+        except Exception as e:
+            self.logger.info(f"❌ Fehler beim Abspielen von '{sound_id}': {e}")
+            return False
 
     def stop(self):
         """Stoppt alle Sounds mit Fade-Out."""
@@ -1,21 +1,42 @@
 import os
 import socket
+import threading
 import time
 from abc import ABC, abstractmethod
-from io import BytesIO
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
 import pygame
 import requests
 import soco
-from pydub import AudioSegment
 from typing_extensions import override
 
 from audio.strategy.sonos_http_server import start_http_server
-from audio.strategy.sound_info import SoundInfo
+from audio.strategy.sound_info import SoundInfo, sonos_url_prefix
 from util.loggin_mixin import LoggingMixin
 
 
+# Feste Mixer-Parameter, einmal definiert statt bei jeder Initialisierung
+PYGAME_MIXER_ARGS = {"frequency": 44100, "size": -16, "channels": 2, "buffer": 512}
+
+
+@lru_cache(maxsize=16)
+def equal_power_fade_gains(steps: int) -> np.ndarray:
+    """
+    Gibt die vorberechnete Gleichleistungs-Fade-Kurve g(n) = cos(πn/2N) zurück.
+
+    Die Kurve wird pro Schrittanzahl nur einmal berechnet und vermeidet
+    hörbare Lautstärkesprünge gegenüber einem linearen Fade.
+    """
+    gains = np.cos(
+        np.linspace(0.0, np.pi / 2, steps, endpoint=False, dtype=np.float32)
+    )
+    gains.flags.writeable = False
+    return gains
+
+
 class AudioStrategyFactory:
     @staticmethod
     def create_pygame_strategy():
@@ -61,10 +82,17 @@ class AudioPlaybackStrategy(ABC):
         """Perform a fade out effect."""
         pass
 
+    def preload(self, sound_path: str) -> None:
+        """Keep a frequently played sound ready for playback (optional)."""
+        pass
+
 
 class SonosAudioStrategy(AudioPlaybackStrategy, LoggingMixin):
     """Implementiert Audio-Wiedergabe über Sonos-Lautsprecher."""
 
+    # Abfrageintervall für das Clip-Ende, erst nach Ablauf der bekannten Dauer
+    STATUS_POLL_INTERVAL = 0.1
+
     def __init__(
         self,
         speaker_name: str = None,
@@ -79,6 +107,10 @@ class SonosAudioStrategy(AudioPlaybackStrategy, LoggingMixin):
         self._initial_sonos_volume = None
         self._current_volume = 1.0
         self.http_server = None
+        self._playback_stopped = threading.Event()
+        # Gesetzt, solange kein Fade-Out läuft
+        self._fade_finished = threading.Event()
+        self._fade_finished.set()
 
     @override
     def initialize(self):
@@ -223,7 +255,7 @@ class SonosAudioStrategy(AudioPlaybackStrategy, LoggingMixin):
         if not sound_url:
             return False
 
-        if not self._check_url_availability(sound_url):
+        if not self._is_servable(sound_info, sound_url):
             return False
 
         try:
@@ -232,11 +264,20 @@ class SonosAudioStrategy(AudioPlaybackStrategy, LoggingMixin):
             sonos_volume = int(min(100, max(0, self._current_volume * 100)))
             self.sonos_device.volume = sonos_volume
 
+            self._playback_stopped.clear()
             self.sonos_device.play_uri(sound_url)
 
-            while self.is_playing():
-                time.sleep(0.1)
-
+            # Die Cliplänge ohne Netzwerkabfragen abwarten und erst gegen Ende
+            # den Status pollen; stop_playback/fade_out beenden das Warten sofort
+            if not self._playback_stopped.wait(max(0.0, self._track_duration() - 1.0)):
+                while self.is_playing() and not self._playback_stopped.wait(
+                    self.STATUS_POLL_INTERVAL
+                ):
+                    pass
+
+            # Ein laufender Fade-Out stellt selbst die Lautstärke zurück und
+            # muss abgeschlossen sein, bevor der nächste Clip starten darf
+            self._fade_finished.wait()
             self.sonos_device.volume = previous_volume
 
             return True
@@ -245,19 +286,42 @@ class SonosAudioStrategy(AudioPlaybackStrategy, LoggingMixin):
             self.logger.error("❌ Fehler beim Abspielen der URL: %s", e)
             return False
 
+    def _track_duration(self) -> float:
+        """Liefert die Dauer des aktuellen Titels in Sekunden, 0 falls unbekannt."""
+        try:
+            duration = self.sonos_device.get_current_track_info()["duration"]
+            hours, minutes, seconds = (int(part) for part in duration.split(":"))
+            return hours * 3600 + minutes * 60 + seconds
+        except Exception:
+            return 0.0
+
     def _get_sound_url(self, sound_info: SoundInfo):
         """Ermittelt die URL für einen Sound."""
         if sound_info.url:
             return sound_info.url
 
-        category = sound_info.category
-        filename = sound_info.filename
-
-        sound_url = f"http://{self.http_server_ip}:{self.http_server_port}/audio/sounds/{category}/{filename}"
-        self.logger.info("🔊 Spiele Sound auf Sonos ab: %s", sound_url)
+        sound_url = (
+            sonos_url_prefix(self.http_server_ip, self.http_server_port)
+            + f"{sound_info.category}/{sound_info.filename}"
+        )
+        self.logger.debug("🔊 Spiele Sound auf Sonos ab: %s", sound_url)
 
         return sound_url
 
+    def _is_servable(self, sound_info: SoundInfo, url) -> bool:
+        """
+        Prüft, ob Sonos die Datei abrufen kann. Liegt sie lokal vor und läuft
+        der eigene HTTP-Server, entfällt die HEAD-Anfrage vor jeder Wiedergabe.
+        """
+        if (
+            self.http_server
+            and self.http_server.is_running()
+            and os.path.isfile(sound_info.path)
+        ):
+            return True
+
+        return self._check_url_availability(url)
+
     def _check_url_availability(self, url):
         """Prüft, ob eine URL verfügbar ist."""
         try:
@@ -304,6 +368,7 @@ class SonosAudioStrategy(AudioPlaybackStrategy, LoggingMixin):
         if not self.sonos_device:
             return
 
+        self._playback_stopped.set()
         try:
             self.sonos_device.stop()
         except Exception as e:
@@ -329,11 +394,17 @@ class SonosAudioStrategy(AudioPlaybackStrategy, LoggingMixin):
             "🔉 Führe Fade-Out über %.1f Sekunden durch...", duration
         )
 
+        self._fade_finished.clear()
         try:
             self._perform_fade_out(duration)
         except Exception as e:
             self.logger.error("❌ Fehler beim Fade-Out: %s", e)
             self.sonos_device.stop()
+        finally:
+            # Erst nach dem stop() freigeben, sonst startet play_sound den
+            # nächsten Clip, den das stop() des Fades wieder abbricht
+            self._fade_finished.set()
+            self._playback_stopped.set()
 
 
     def _perform_fade_out(self, duration):
@@ -345,13 +416,10 @@ class SonosAudioStrategy(AudioPlaybackStrategy, LoggingMixin):
             self.sonos_device.stop()
             return
 
-        volume_step = start_volume / steps
         time_step = duration / steps
+        volumes = (equal_power_fade_gains(steps) * start_volume).astype(int)
 
-        for step in range(steps):
-            current_volume = start_volume - (volume_step * step)
-            current_volume = max(0, int(current_volume))
-
+        for current_volume in volumes.tolist():
             self.sonos_device.volume = current_volume
             time.sleep(time_step)
 
@@ -364,42 +432,87 @@ class SonosAudioStrategy(AudioPlaybackStrategy, LoggingMixin):
 
 
 class PygameAudioStrategy(AudioPlaybackStrategy, LoggingMixin):
+    # Anzahl dekodierter Sounds, die für wiederkehrende Ausgaben im Speicher bleiben
+    SOUND_CACHE_SIZE = 64
+
     def __init__(self):
         self._current_volume = 1.0
+        # LRU-Cache Pfad -> (Änderungszeit, dekodierter Sound); wiederkehrende
+        # Sounds wie der Wakeword-Ton werden so nur einmal dekodiert
+        self._sound_cache: OrderedDict[str, tuple] = OrderedDict()
+        self._sound_cache_lock = threading.Lock()
+        # Vorab dekodierte Feedback-Sounds, die der LRU-Cache nie verdrängt
+        self._pinned_sounds: dict[str, tuple] = {}
+        # Wird beim Stoppen gesetzt und weckt die wartende Wiedergabe sofort auf
+        self._playback_stopped = threading.Event()
 
     def initialize(self):
         """Initialisiert den Pygame-Mixer."""
-        pygame.mixer.init()
+        pygame.mixer.init(**PYGAME_MIXER_ARGS)
         self.logger.info("✅ Pygame-Audiosystem initialisiert")
 
     def play_sound(self, sound_info: SoundInfo) -> bool:
         """Spielt einen Sound mit Pygame ab."""
         try:
-            sound_path = sound_info.path
-
-            sound = AudioSegment.from_file(sound_path)
-
-            audio_io = BytesIO()
-            sound.export(audio_io, format="wav")
-            audio_io.seek(0)
-
-            pygame_sound = pygame.mixer.Sound(audio_io)
+            pygame_sound = self._load_sound(sound_info.path)
 
             pygame_sound.set_volume(max(0.0, min(1.0, self._current_volume)))
 
-            pygame_sound.play()
+            self._playback_stopped.clear()
+            channel = pygame_sound.play()
+            if channel is None:
+                return False
 
-            while pygame.mixer.get_busy():
-                pygame.time.wait(100)
+            # Statt alle 100 ms den Mixer abzufragen, schläft der Thread für
+            # die Länge des Sounds und wird bei einem Stopp sofort geweckt
+            if not self._playback_stopped.wait(pygame_sound.get_length()):
+                # Kurzer Nachlauf, falls der Mixer leicht hinterherhinkt
+                while channel.get_busy() and not self._playback_stopped.wait(0.02):
+                    pass
 
             return True
 
         except Exception as e:
             self.logger.error(f"❌ Fehler beim Abspielen des Sounds: {e}")
             return False
-        finally:
-            if "audio_io" in locals():
-                audio_io.close()
+
+    def _load_sound(self, sound_path: str) -> pygame.mixer.Sound:
+        """
+        Gibt den dekodierten Sound aus dem LRU-Cache zurück und dekodiert ihn
+        nur beim ersten Abspielen oder nach einer Änderung der Datei.
+        """
+        mtime = os.path.getmtime(sound_path)
+
+        with self._sound_cache_lock:
+            pinned = self._pinned_sounds.get(sound_path)
+            if pinned is not None and pinned[0] == mtime:
+                return pinned[1]
+
+            cached = self._sound_cache.get(sound_path)
+            if cached is not None and cached[0] == mtime:
+                self._sound_cache.move_to_end(sound_path)
+                return cached[1]
+
+        # SDL_mixer dekodiert MP3 selbst und wandelt direkt ins Mixer-Format;
+        # kein ffmpeg-Prozess und keine Zwischenkopie über pydub
+        pygame_sound = pygame.mixer.Sound(sound_path)
+
+        with self._sound_cache_lock:
+            self._sound_cache[sound_path] = (mtime, pygame_sound)
+            self._sound_cache.move_to_end(sound_path)
+            if len(self._sound_cache) > self.SOUND_CACHE_SIZE:
+                self._sound_cache.popitem(last=False)
+
+        return pygame_sound
+
+    def preload(self, sound_path: str) -> None:
+        """Dekodiert einen Sound vorab und hält ihn dauerhaft im Speicher."""
+        mtime = os.path.getmtime(sound_path)
+        pygame_sound = pygame.mixer.Sound(sound_path)
+
+        with self._sound_cache_lock:
+            self._pinned_sounds[sound_path] = (mtime, pygame_sound)
+            self._sound_cache.pop(sound_path, None)
 
     def is_playing(self) -> bool:
         return pygame.mixer.get_busy()
@@ -407,6 +520,7 @@ class PygameAudioStrategy(AudioPlaybackStrategy, LoggingMixin):
     def stop_playback(self):
         """Stoppt alle Pygame-Audio-Wiedergaben."""
         pygame.mixer.stop()
+        self._playback_stopped.set()
 
     def set_volume(self, volume: float):
         """Setzt die Lautstärke für alle aktiven Pygame-Kanäle."""
@@ -423,24 +537,14 @@ class PygameAudioStrategy(AudioPlaybackStrategy, LoggingMixin):
 
         self.logger.info(f"🔉 Führe Fade-Out über {duration} Sekunden durch...")
 
-        start_volume = self._current_volume
-
-        steps = int(duration * 20)
-
-        volume_step = start_volume / steps if steps > 0 else 0
-
-        time_step = duration / steps if steps > 0 else 0
-
-        for step in range(steps):
-            current_volume = start_volume - (volume_step * step)
-            current_volume = max(0.0, current_volume)
-
-            for i in range(pygame.mixer.get_num_channels()):
-                channel = pygame.mixer.Channel(i)
-                if channel.get_busy():
-                    channel.set_volume(current_volume)
-
-            time.sleep(time_step)
+        fade_ms = int(duration * 1000)
+        if fade_ms > 0:
+            # Der Mixer blendet nur die verbleibenden Samples aus, statt dass
+            # wir die Kanal-Lautstärke in Python-Schritten herunterregeln.
+            pygame.mixer.fadeout(fade_ms)
+            while pygame.mixer.get_busy():
+                pygame.time.wait(50)
 
         pygame.mixer.stop()
+        self._playback_stopped.set()
         self.logger.info("🔇 Fade-Out abgeschlossen")
@@ -1,9 +1,18 @@
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from pyparsing import Optional
 from typing import Optional
 
 
+@lru_cache(maxsize=8)
+def sonos_url_prefix(http_server_ip: str, http_server_port: int) -> str:
+    """
+    Gibt das URL-Präfix des Sonos-HTTP-Servers zurück; IP und Port ändern
+    sich nach dem Start nicht, das Präfix wird daher nur einmal gebaut.
+    """
+    return f"http://{http_server_ip}:{http_server_port}/audio/sounds/"
+
+
 @dataclass
 class SoundInfo:
     path: str
@@ -16,5 +25,5 @@ class SoundInfo:
     ) -> None:
         sound_path = Path(self.path)
         rel_path = sound_path.relative_to(base_dir)
-        url_path = str(rel_path).replace("\\", "/")
-        self.url = f"http://{http_server_ip}:{http_server_port}/audio/sounds/{url_path}"
+        url_path = rel_path.as_posix()
+        self.url = sonos_url_prefix(http_server_ip, http_server_port) + url_path
@@ -1,4 +1,7 @@
 import os
+import threading
+import time
+from typing import Iterable
 
 from audio.strategy.audio_manager import get_audio_manager
 from service.tts_generator import get_tts_generator
@@ -33,6 +36,36 @@ class WorkflowAudioResponseManager(LoggingMixin):
             f"Kategorie '{category}' und Ausgabeverzeichnis '{output_dir}'"
         )
 
+    # Abstand zwischen zwei Vorab-Generierungen, um das API-Limit zu schonen
+    PREWARM_INTERVAL = 1.0
+
+    def prewarm(self, phrases: Iterable[str]) -> None:
+        """
+        Erzeugt die TTS-Dateien für feste Standardantworten im Hintergrund,
+        damit schon die erste Antwort ohne API-Aufruf abgespielt wird.
+        """
+        threading.Thread(
+            target=self._prewarm, args=(list(phrases),), daemon=True
+        ).start()
+
+    @log_exceptions_from_self_logger("beim Vorwärmen der Standardantworten")
+    def _prewarm(self, phrases: list) -> None:
+        generated = 0
+        for phrase in phrases:
+            if self.tts_generator.is_cached(phrase, self.category):
+                continue
+
+            if generated:
+                time.sleep(self.PREWARM_INTERVAL)
+
+            self.tts_generator.generate_tts(phrase, self.category, self.voice)
+            generated += 1
+
+        if generated:
+            self.logger.info(
+                f"🔥 {generated} Standardantworten für '{self.category}' vorab generiert"
+            )
+
     @log_exceptions_from_self_logger("beim Abspielen der Audioantwort")
     def play_response(self, message: str) -> str:
         """
@@ -9,6 +9,8 @@ GPT = "gpt-4o"
 
 GEMINI_FLASH = "gemini-2.0-flash"
 
+TTS_MODEL = "tts-1"
+
 TAVILY_MAX_RESULTS = 2
 
 NOTION_API_KEY = os.getenv("NOTION_API_KEY")
@@ -1,8 +1,6 @@
 import asyncio
-import time
-import traceback
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Coroutine, Optional, Set
 
 from typing_extensions import override
 
@@ -10,8 +8,6 @@ from audio.strategy.audio_manager import get_audio_manager
 from graphs.core.workflow_dispatcher import WorkflowDispatcher
 from integrations.phillips_hue.animation.light_animation import (
     AnimationType, LightAnimationFactory)
-from integrations.phillips_hue.bridge import HueBridge
-from integrations.phillips_hue.light_controller import LightController
 from service.service_locator import ServiceLocator
 from util.decorator import non_blocking
 from util.loggin_mixin import LoggingMixin
@@ -20,6 +16,8 @@ from util.loggin_mixin import LoggingMixin
 class ConversationStateMachine(LoggingMixin):
     _instance = None
     wakeword_listener = None
+    # Werden bei jedem Wake-Word bzw. Fehler abgespielt und daher vorab geladen
+    FEEDBACK_SOUNDS = ("wakesound", "error-1", "stop-listening-no-message")
 
     def __init__(
         self,
@@ -31,6 +29,9 @@ class ConversationStateMachine(LoggingMixin):
         self.audio_manager = get_audio_manager()
         self.should_stop = False
         self.current_state = None
+        # Starke Referenzen auf Hintergrundaufgaben, damit sie weder vom GC
+        # eingesammelt werden noch beim Beenden unbeaufsichtigt weiterlaufen
+        self._background_tasks: Set[asyncio.Task] = set()
         
         ConversationStateMachine.wakeword_listener = ServiceLocator.get_instance().get_wake_word_listener()
         
@@ -42,9 +43,33 @@ class ConversationStateMachine(LoggingMixin):
 
     async def run(self):
         """Startet die Zustandsmaschine"""
-        self.current_state = WaitingForWakeWordState()
+        audio_transcriber = ServiceLocator.get_instance().get_audio_transcriber()
+        self.spawn(audio_transcriber.warm_up())
+        self.spawn(asyncio.to_thread(self.audio_manager.preload, self.FEEDBACK_SOUNDS))
+
+        # Der Wartezustand wird einmal erzeugt und bei jeder Rückkehr
+        # wiederverwendet, statt pro Durchlauf neu aufgebaut zu werden.
+        self._waiting_state = WaitingForWakeWordState()
+        self.current_state = self._waiting_state
             
-        await self._run_state_machine()
+        try:
+            await self._run_state_machine()
+        finally:
+            await self._cancel_background_tasks()
+
+    def spawn(self, coro: Coroutine) -> asyncio.Task:
+        """Startet eine Hintergrundaufgabe, deren Lebensdauer die Zustandsmaschine verwaltet"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    async def _cancel_background_tasks(self):
+        """Bricht alle noch laufenden Hintergrundaufgaben ab und wartet auf sie"""
+        tasks = list(self._background_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
     async def _run_state_machine(self):
         while not self.should_stop:
@@ -53,7 +78,7 @@ class ConversationStateMachine(LoggingMixin):
                 next_state = await self.current_state.process()
                 
                 if next_state is None:
-                    self.current_state = WaitingForWakeWordState()
+                    self.current_state = self._waiting_state
                 else:
                     self.current_state = next_state
                 
@@ -62,31 +87,43 @@ class ConversationStateMachine(LoggingMixin):
                 self.should_stop = True
                 
             except Exception as e:
-                self.logger.error("❌ Unerwarteter Fehler in der Zustandsmaschine: %s", e)
-                self.logger.error("Traceback: %s", traceback.format_exc())
+                self.logger.error(
+                    "❌ Unerwarteter Fehler in der Zustandsmaschine: %s", e, exc_info=True
+                )
                 
-                self.current_state = WaitingForWakeWordState()
+                self.current_state = self._waiting_state
 
     def stop(self):
         self.should_stop = True
+        if ConversationStateMachine.wakeword_listener is not None:
+            ConversationStateMachine.wakeword_listener.stop()
         self.logger.info("Zustandsmaschine wird gestoppt...")
 
 
 class ConversationState(ABC, LoggingMixin):
+    # Von allen Zuständen geteilt: Zustände entstehen bei jedem Übergang neu,
+    # der Hue-Stack muss dafür aber nicht jedes Mal neu aufgebaut werden
+    _light_animation_factory: Optional[LightAnimationFactory] = None
+
     def __init__(self):
         super().__init__()
         
         self.audio_manager = get_audio_manager()
         
-        bridge = HueBridge.connect_by_ip()
-        controller = LightController(bridge)
-        
-        self.light_animation_factory = LightAnimationFactory(controller)
+        self.light_animation_factory = ConversationState._get_light_animation_factory()
         
         self.wake_flash_animation = self.light_animation_factory.get_wake_flash_animation()
         
         self._next_state = None
 
+    @staticmethod
+    def _get_light_animation_factory() -> LightAnimationFactory:
+        if ConversationState._light_animation_factory is None:
+            # LightController des ServiceLocators wiederverwenden statt eigener Bridge
+            controller = ServiceLocator.get_instance().get_lighting_controller()
+            ConversationState._light_animation_factory = LightAnimationFactory(controller)
+        return ConversationState._light_animation_factory
+
     @abstractmethod
     async def process(self) -> Optional['ConversationState']:
         """
@@ -110,8 +147,10 @@ class ConversationState(ABC, LoggingMixin):
         source_state = self.get_name()
         
         if isinstance(exception, Exception):
-            self.logger.error(f"❌ Fehler in {source_state}: {error_message}")
-            self.logger.error(f"Traceback: {traceback.format_exc()}")
+            # exc_info formatiert den Traceback erst im Handler
+            self.logger.error(
+                "❌ Fehler in %s: %s", source_state, error_message, exc_info=exception
+            )
         else:
             self.logger.error(f"❌ Fehlerfall in {source_state}: {error_message}")
         
@@ -131,14 +170,18 @@ class WaitingForWakeWordState(ConversationState):
         # Access the wakeword_listener from the ConversationStateMachine
         wakeword_listener = ConversationStateMachine.wakeword_listener
         
-        if wakeword_listener.listen_for_wakeword():
+        # Das blockierende Warten läuft im Worker-Thread, damit Hintergrundaufgaben
+        # auf dem Event-Loop weiterlaufen; stop() des Listeners beendet es sofort.
+        if await asyncio.to_thread(wakeword_listener.listen_for_wakeword):
             await self.provide_light_feedback()
-            self.play_audio_feedback("wakesound", block=True)
+            # Bis zum Ende des Wake-Sounds warten, ohne den Event-Loop zu
+            # blockieren, damit die Lichtanimation parallel weiterläuft
+            await asyncio.to_thread(self.play_audio_feedback, "wakesound", True)
             self.logger.info("🔔 Wake-Word erkannt!")
             
             return WakeWordDetectedState()
         
-        await asyncio.sleep(0.1)
+        # Nur nach stop() erreichbar, die Zustandsmaschine beendet sich dann
         return None
     
     @override
@@ -152,16 +195,22 @@ class WakeWordDetectedState(ConversationState):
     
     def __init__(self):
         super().__init__()
-        self.speech_service = ServiceLocator().get_instance().get_speech_service()
-        self.speech_recorder = ServiceLocator().get_instance().get_speech_recorder()
+        service_locator = ServiceLocator.get_instance()
+        self.speech_service = service_locator.get_speech_service()
+        self.speech_recorder = service_locator.get_speech_recorder()
     
     @override
     async def process(self):
         self.logger.info("🎙️ Starte Sprachaufnahme...")
-        self.speech_service.interrupt_and_reset()
+        # Das Stoppen kann mit Fade-Out dauern und läuft daher im Hintergrund
+        ConversationStateMachine.get_instance().spawn(
+            asyncio.to_thread(self.speech_service.interrupt_and_reset)
+        )
         
         try:
-            audio_data = self.speech_recorder.record_audio()
+            # Die Aufnahme blockiert bis zur erkannten Stille und läuft daher
+            # in einem Worker-Thread, damit der Event-Loop frei bleibt.
+            audio_data = await asyncio.to_thread(self.speech_recorder.record_audio)
             await self.provide_light_feedback()
             
             return TranscribingState(
@@ -196,11 +245,11 @@ class TranscribingState(ConversationState):
             
             if not user_prompt or user_prompt.strip() == "":
                  self.play_audio_feedback("stop-listening-no-message")
-                 return WaitingForWakeWordState()
+                 return None
             
             self.logger.info("🗣 Erkannt: %s", user_prompt)
             
-            workflow_dispatcher = WorkflowDispatcher()
+            workflow_dispatcher = ServiceLocator.get_instance().get_workflow_dispatcher()
             
             return DispatchingState(
                 workflow_dispatcher=workflow_dispatcher,
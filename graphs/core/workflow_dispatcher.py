@@ -1,4 +1,6 @@
+import inspect
 import textwrap
+import time
 from typing import Any, Dict, TypedDict
 
 from langchain_core.messages import HumanMessage
@@ -13,6 +15,10 @@ from service.speech_service import SpeechService
 from util.loggin_mixin import LoggingMixin
 
 
+# Observer, die länger als diese Schwelle (Sekunden) laufen, halten den Graphen auf
+SLOW_OBSERVER_THRESHOLD = 0.005
+
+
 class WorkflowState(TypedDict):
     user_message: str
     workflow: str
@@ -89,7 +95,7 @@ class WorkflowDispatcher(LoggingMixin):
         else:
             state["workflow"] = "default"
 
-        self._notify_workflow_selected(state["workflow"], state)
+        await self._notify_workflow_selected(state["workflow"], state)
 
         return state
 
@@ -143,8 +149,26 @@ class WorkflowDispatcher(LoggingMixin):
         if observer in self.observers:
             self.observers.remove(observer)
 
-    def _notify_workflow_selected(
+    async def _notify_workflow_selected(
         self, workflow_name: str, context: Dict[str, Any]
     ) -> None:
+        """
+        Benachrichtigt alle Observer. Asynchrone Callbacks werden direkt
+        awaited, langsame Observer werden als Warnung sichtbar gemacht.
+        """
         for observer in self.observers:
-            observer.on_workflow_selected(workflow_name, context)
+            callback = observer.on_workflow_selected
+            started = time.monotonic()
+
+            if inspect.iscoroutinefunction(callback):
+                await callback(workflow_name, context)
+            else:
+                callback(workflow_name, context)
+
+            elapsed = time.monotonic() - started
+            if elapsed > SLOW_OBSERVER_THRESHOLD:
+                self.logger.warning(
+                    "🐢 Observer %s brauchte %.1f ms",
+                    observer.__class__.__name__,
+                    elapsed * 1000,
+                )
@@ -113,17 +113,17 @@ class WorkflowRegistry:
         Returns:
             Formatierter String mit Workflow-Informationen
         """
-        formatted = ""
+        lines = []
         for name, data in cls._workflows.items():
             capabilities = (
                 ", ".join(data["capabilities"])
                 if data["capabilities"]
                 else "Keine spezifischen Fähigkeiten"
             )
-            formatted += (
+            lines.append(
                 f"- {name}: {data['description']} (Fähigkeiten: {capabilities})\n"
             )
-        return formatted
+        return "".join(lines)
 
     @classmethod
     def get_workflow_names(cls) -> List[str]:
@@ -164,12 +164,12 @@ class SecondBrainWorkflow(BaseGraph):
         self, research_results, search_query: str
     ) -> str:
         """Formatiert die Recherche-Ergebnisse für die Notion-Notiz."""
-        note_content = f"# Recherche zu '{search_query}'\n\n"
-        note_content += "## Zusammenfassung\n\n"
-        note_content += (
-            "Dies ist eine automatisch generierte Notiz mit Recherche-Ergebnissen.\n\n"
-        )
-        note_content += "## Recherche-Ergebnisse\n\n"
+        parts = [
+            f"# Recherche zu '{search_query}'\n\n",
+            "## Zusammenfassung\n\n",
+            "Dies ist eine automatisch generierte Notiz mit Recherche-Ergebnissen.\n\n",
+            "## Recherche-Ergebnisse\n\n",
+        ]
 
         if isinstance(research_results, list):
             for idx, result in enumerate(research_results, 1):
@@ -178,21 +178,22 @@ class SecondBrainWorkflow(BaseGraph):
                     url = result.get("url", "Keine URL verfügbar")
                     content = result.get("content", "Kein Inhalt verfügbar")
 
-                    note_content += f"### {idx}. {title}\n"
-                    note_content += f"**Quelle:** {url}\n\n"
-                    note_content += f"{content}\n\n"
+                    parts.append(f"### {idx}. {title}\n")
+                    parts.append(f"**Quelle:** {url}\n\n")
+                    parts.append(f"{content}\n\n")
                 else:
-                    note_content += f"### {idx}. Ergebnis\n"
-                    note_content += f"{str(result)}\n\n"
+                    parts.append(f"### {idx}. Ergebnis\n")
+                    parts.append(f"{str(result)}\n\n")
         else:
-            note_content += str(research_results)
+            parts.append(str(research_results))
 
-        note_content += "\n\n## Weitere Schritte\n\n"
-        note_content += "- Diese Notiz bearbeiten und verfeinern\n"
-        note_content += "- Relevante Informationen extrahieren\n"
-        note_content += "- Mit anderen Projekten oder Notizen verknüpfen\n"
+        parts.append("\n\n## Weitere Schritte\n\n")
+        parts.append("- Diese Notiz bearbeiten und verfeinern\n")
+        parts.append("- Relevante Informationen extrahieren\n")
+        parts.append("- Mit anderen Projekten oder Notizen verknüpfen\n")
 
-        return note_content
+        # Einmaliges Zusammenfügen statt wiederholtem Umkopieren per +=
+        return "".join(parts)
 
     async def _finalize_response(
         self, state: SecondBrainWorkflowState
@@ -120,14 +120,20 @@ class LightAnimation(ABC, LoggingMixin):
     
     async def _save_light_states(self, light_ids: List[str]) -> Dict[str, Dict[str, Any]]:
         """Speichert den aktuellen Zustand aller angegebenen Lampen"""
+        # Alle Lampen parallel abfragen: die Wartezeit entspricht der langsamsten
+        # Anfrage statt der Summe aller Round-Trips
+        results = await asyncio.gather(
+            *(self.controller.get_light_state(light_id) for light_id in light_ids),
+            return_exceptions=True,
+        )
+
         states = {}
-        for light_id in light_ids:
-            try:
-                state = await self.controller.get_light_state(light_id)
-                states[light_id] = state.copy()
-            except Exception as e:
-                self.logger.error(f"Fehler beim Abrufen des Zustands für Lampe {light_id}: {e}")
+        for light_id, state in zip(light_ids, results):
+            if isinstance(state, Exception):
+                self.logger.error(f"Fehler beim Abrufen des Zustands für Lampe {light_id}: {state}")
                 states[light_id] = {"on": True, "bri": 127}
+            else:
+                states[light_id] = state.copy()
         return states
     
     async def _restore_light_states(self, states: Dict[str, Dict[str, Any]], transition_time: int = 10) -> None:
@@ -39,8 +39,15 @@ class SceneBasedSunriseController:
 
     def stop_sunrise(self) -> None:
         self.should_stop = True
-        if self.running_sunrise and not self.running_sunrise.done():
-            self.running_sunrise.cancel()
+        task = self.running_sunrise
+        if task and not task.done():
+            # Der Task läuft im Event-Loop des Alarm-Threads; cancel() darf nur
+            # dort aufgerufen werden, daher über den Loop des Tasks einplanen
+            try:
+                task.get_loop().call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                # Loop bereits geschlossen, der Task ist damit ohnehin beendet
+                pass
         self.running_sunrise = None
 
     async def get_scene_light_states(
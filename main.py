@@ -1,10 +1,14 @@
 import asyncio
+import sys
 
 from dotenv import load_dotenv
 
 from core.state import ConversationStateMachine
 from graphs.core.workflow_registry import register_workflows
 from service.service_locator import ServiceLocator
+from service.tts_generator import get_tts_generator
+from tools.light_tools import prewarm_hue_responses
+from tools.spotify_tools import prewarm_spotify_responses
 
 load_dotenv()
 
@@ -12,6 +16,11 @@ register_workflows()
 
 service_lcoator = ServiceLocator.get_instance()
 
+# Fehlende feste Tool-Antworten erst beim Programmstart erzeugen, nicht schon
+# beim Import der Tool-Module
+prewarm_hue_responses()
+prewarm_spotify_responses()
+
 async def main():
     state_machine = ConversationStateMachine(
         wakeword="picovoice",
@@ -23,9 +32,16 @@ async def main():
         print("Beende das Programm...")
     finally:
         service_lcoator.get_speech_service().shutdown()
+        get_tts_generator().stop_cleanup()
         service_lcoator.get_wake_word_listener().cleanup()
         state_machine.stop()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    if sys.platform == "win32":
+        asyncio.run(main())
+    else:
+        # libuv-basierter Event-Loop mit geringerem Overhead pro Callback
+        import uvloop
+
+        uvloop.run(main())
\ No newline at end of file
@@ -1,15 +1,17 @@
+import asyncio
 import os
 import queue
 import time
 import wave
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-import aiofiles
 import numpy as np
 import sounddevice as sd
 from dotenv import load_dotenv
-from openai import AsyncOpenAI, OpenAI
+from openai import AsyncOpenAI
 
 from util.decorator import measure_performance
 from util.loggin_mixin import LoggingMixin
@@ -17,29 +19,58 @@ from util.loggin_mixin import LoggingMixin
 load_dotenv()
 
 class SpeechRecorder(LoggingMixin):
-    def __init__(self, samplerate=44100):
-        """Initialisiert die OpenAI Whisper API-Anbindung mit verbesserter Audioqualität"""
-        self.openai = OpenAI()
+    BLOCK_DURATION = 0.1
+    RING_BLOCKS = 32
+    # Vor- und Nachlauf in Blöcken, die um laute Blöcke herum mitgeschrieben werden
+    PREROLL_BLOCKS = 2
+    HANGOVER_BLOCKS = 3
+
+    # Whisper rechnet intern mit 16 kHz; höhere Raten vergrößern nur den Upload
+    WHISPER_SAMPLERATE = 16000
+
+    def __init__(self, samplerate=WHISPER_SAMPLERATE):
+        """
+        Initialisiert die Mikrofonaufnahme. Der Whisper-Client gehört allein
+        dem AudioTranscriber, der Recorder legt keinen eigenen an.
+        """
         self.set_open_ai_key()
         self.samplerate = samplerate
-        self.audio_queue = queue.Queue()
+        self.block_size = int(samplerate * self.BLOCK_DURATION)
+        # SimpleQueue: put() aus dem Echtzeit-Callback ist in C implementiert,
+        # reentrant und ohne task_done-Verwaltung, die hier nie genutzt wird
+        self.audio_queue = queue.SimpleQueue()
         self.is_recording = False
+
+        # Ringpuffer, in den der Audio-Callback ohne Neuallokation schreibt;
+        # über die Queue werden nur Blocknummer und Spitzenpegel gereicht.
+        self._ring = np.empty((self.RING_BLOCKS, self.block_size), dtype=np.int16)
+        self._ring_head = 0
+        # Arbeitspuffer für einen entnommenen Stapel; wird einmal angelegt und
+        # über alle Aufnahmen hinweg wiederverwendet
+        self._batch = np.empty_like(self._ring)
+        self._stream_status = None
         
         self.base_path = Path(__file__).parent.parent / "audio" / "sounds" / "temp"
 
     def audio_callback(self, indata, frames, time, status):
-        """Fügt Audiodaten zum Queue hinzu und überwacht Status"""
+        """
+        Fügt Audiodaten zum Queue hinzu. Status und Übersteuerung werden nur
+        vermerkt und im Aufnahme-Thread geloggt, damit der Echtzeit-Callback
+        nie auf einen Logging-Handler warten muss.
+        """
         if status:
-            self.logger.warning(f"⚠️ Audio-Status: {status}")
+            self._stream_status = status
         
         if not self.is_recording:
             return
             
-        peak = np.max(np.abs(indata))
-        if peak >= 32700:
-            self.logger.warning("🔊 Warnung: Audio übersteuert!")
-            
-        self.audio_queue.put(indata.copy())
+        block = self._ring[self._ring_head % self.RING_BLOCKS]
+        block[:] = indata[:, 0]
+
+        # Spitzenpegel ohne Zwischenarray für np.abs berechnen
+        peak = max(int(block.max()), -int(block.min()))
+        self.audio_queue.put((self._ring_head, peak))
+        self._ring_head += 1
 
     def record_audio(
         self,
@@ -47,49 +78,78 @@ class SpeechRecorder(LoggingMixin):
         silence_threshold=0.1,
         silence_duration=1.5,
         gain=2.0,
+        gate_silence=False,
     ):
+        """
+        Nimmt bis zur erkannten Stille auf. Standardmäßig wird die komplette
+        Aufnahme geschrieben, da Whisper die Pausen zwischen Sätzen für
+        Zeichensetzung und Segmentierung nutzt; mit gate_silence=True werden
+        längere Pausen vor dem Upload herausgeschnitten.
+        """
         if filename is None:
             filename = str(self.base_path / "recorded_audio.wav")
         
         os.makedirs(os.path.dirname(filename), exist_ok=True)
 
+        try:
+            wav_file = self._open_wave_file(filename)
+        except Exception as e:
+            self.logger.error(f"❌ Fehler beim Speichern der Audiodatei: {e}")
+            return None
+
         self.is_recording = True
-        buffer = []
-        start_time = time.time()
+        recorded_blocks = 0
+        written_blocks = 0
+        self._last_written = self._ring_head - 1
+        self._quiet_run = self.HANGOVER_BLOCKS
+        window_blocks = round(0.5 / self.BLOCK_DURATION)
+        threshold_peak = silence_threshold * 32767
+        # Anzahl leiser Blöcke seit dem letzten lauten Block; ersetzt das
+        # Maximum über das 0,5-Sekunden-Fenster durch einen O(1)-Zähler
+        quiet_blocks = window_blocks
+        start_time = time.monotonic()
         self.logger.info("🎙 Aufnahme gestartet...")
 
         try:
-            with sd.InputStream(
+            with wav_file, sd.InputStream(
                 samplerate=self.samplerate,
                 channels=1,
                 dtype=np.int16,
-                blocksize=int(self.samplerate * 0.1),
+                blocksize=self.block_size,
                 callback=self.audio_callback,
             ):
                 while True:
-                    if self.audio_queue.empty():
-                        time.sleep(0.01)
+                    blocks = self._drain_audio_queue()
+                    if not blocks:
                         continue
-                        
-                    current_audio = self.audio_queue.get()
-                    buffer.append(current_audio)
-
-                    window_size = int(self.samplerate * 0.5)
-                    recent_samples = (
-                        np.concatenate(buffer[-5:])
-                        if len(buffer) > 5
-                        else np.concatenate(buffer)
-                    )
-                    if len(recent_samples) > window_size:
-                        recent_samples = recent_samples[-window_size:]
 
-                    volume = np.max(np.abs(recent_samples)) / 32767.0
+                    now = time.monotonic()
+                    self._report_stream_health(blocks)
+                    blocks = self._discard_overwritten_blocks(blocks)
+
+                    recorded_blocks += len(blocks)
 
-                    if volume >= silence_threshold:
-                        start_time = time.time()
+                    # Verstärken und Schreiben laufen parallel zur Aufnahme, so
+                    # liegt die Datei beim Erkennen der Stille bereits vor.
+                    if gate_silence:
+                        sequences = self._voiced_sequences(blocks, threshold_peak)
+                    else:
+                        sequences = [sequence for sequence, _ in blocks]
+                    if sequences:
+                        chunk = self._copy_from_ring(sequences)
+                        written_blocks += len(sequences)
+                        self._apply_gain(chunk, gain)
+                        wav_file.writeframes(chunk)
+
+                    quiet_blocks = self._update_quiet_blocks(
+                        blocks, threshold_peak, quiet_blocks
+                    )
+
+                    if quiet_blocks < window_blocks:
+                        start_time = now
                         continue
                         
-                    if time.time() - start_time <= silence_duration:
+                    if now - start_time <= silence_duration:
                         continue
                         
                     self.logger.info("⏸ Stille erkannt, Aufnahme stoppt.")
@@ -97,28 +157,121 @@ class SpeechRecorder(LoggingMixin):
         finally:
             self.is_recording = False
 
-        if len(buffer) < 20:
+        if recorded_blocks < 20 or (gate_silence and not written_blocks):
             self.logger.info("❌ Aufnahme zu kurz oder kein Audio erkannt.")
             return None
 
-        audio_data = np.concatenate(buffer, axis=0)
-        
-        audio_data = audio_data * gain
-        audio_data = np.clip(audio_data, -32767, 32767).astype(np.int16)
-
-        try:
-            with wave.open(filename, "wb") as wf:
-                wf.setnchannels(1)
-                wf.setsampwidth(2)
-                wf.setframerate(self.samplerate)
-                wf.writeframes(audio_data.tobytes())
-        except Exception as e:
-            self.logger.error(f"❌ Fehler beim Speichern der Audiodatei: {e}")
-            return None
-        
         self.logger.info(f"✅ Aufnahme gespeichert unter: {filename}")
         return filename
 
+    def _open_wave_file(self, filename):
+        """Öffnet die WAV-Datei, in die während der Aufnahme geschrieben wird."""
+        wav_file = wave.open(filename, "wb")
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(self.samplerate)
+        return wav_file
+
+    def _report_stream_health(self, blocks):
+        """Loggt vom Audio-Callback vermerkte Status- und Übersteuerungsereignisse."""
+        status, self._stream_status = self._stream_status, None
+        if status:
+            self.logger.warning(f"⚠️ Audio-Status: {status}")
+
+        if any(peak >= 32700 for _, peak in blocks):
+            self.logger.warning("🔊 Warnung: Audio übersteuert!")
+
+    def _discard_overwritten_blocks(self, blocks):
+        """
+        Verwirft Blöcke, deren Ringplatz der Callback bereits erneut
+        beschrieben hat.
+        """
+        if self._ring_head - blocks[0][0] <= self.RING_BLOCKS:
+            return blocks
+
+        self.logger.warning("⚠️ Audio-Ringpuffer übergelaufen")
+        oldest_valid = self._ring_head - self.RING_BLOCKS
+        return [block for block in blocks if block[0] >= oldest_valid]
+
+    def _voiced_sequences(self, blocks, threshold_peak):
+        """
+        Wählt die Blöcke eines Stapels aus, die in die Datei gelangen: laute
+        Blöcke samt kurzem Vorlauf aus dem Ringpuffer und einem kurzen
+        Nachlauf. Längere Stille wird nicht an Whisper hochgeladen.
+        """
+        oldest_valid = self._ring_head - self.RING_BLOCKS
+        sequences = []
+        for sequence, peak in blocks:
+            if peak >= threshold_peak:
+                first = max(
+                    self._last_written + 1,
+                    sequence - self.PREROLL_BLOCKS,
+                    oldest_valid,
+                )
+                sequences.extend(range(first, sequence + 1))
+                self._quiet_run = 0
+            else:
+                self._quiet_run += 1
+                if self._quiet_run > self.HANGOVER_BLOCKS:
+                    continue
+                sequences.append(sequence)
+
+            self._last_written = sequence
+        return sequences
+
+    def _copy_from_ring(self, sequences):
+        """
+        Kopiert die angegebenen Blöcke mit einer einzigen NumPy-Operation aus
+        dem Ringpuffer in den wiederverwendeten Arbeitspuffer und gibt die
+        belegten Samples als flache Ansicht zurück.
+        """
+        slots = np.asarray(sequences) % self.RING_BLOCKS
+
+        batch = self._batch[: len(sequences)]
+        np.take(self._ring, slots, axis=0, out=batch)
+        return batch.reshape(-1)
+
+    @staticmethod
+    def _apply_gain(audio_data, gain):
+        """
+        Verstärkt die PCM-Daten direkt im Arbeitspuffer. Statt drei
+        float64-/int16-Zwischenarrays entsteht nur ein float32-Zwischenpuffer.
+        """
+        scaled = np.multiply(audio_data, gain, dtype=np.float32)
+        np.clip(scaled, -32767, 32767, out=scaled)
+        np.copyto(audio_data, scaled, casting="unsafe")
+
+    @staticmethod
+    def _update_quiet_blocks(blocks, threshold_peak, quiet_blocks):
+        """
+        Aktualisiert den Zähler leiser Blöcke für einen ganzen Stapel: nach
+        einem lauten Block zählen nur die darauf folgenden leisen Blöcke.
+        """
+        peaks = np.fromiter(
+            (peak for _, peak in blocks), dtype=np.int32, count=len(blocks)
+        )
+        loud = np.flatnonzero(peaks >= threshold_peak)
+        if loud.size:
+            return len(blocks) - 1 - int(loud[-1])
+        return quiet_blocks + len(blocks)
+
+    def _drain_audio_queue(self, timeout=1.0):
+        """
+        Wartet blockierend auf den nächsten Audioblock und entnimmt danach
+        alle bereits gepufferten Blöcke in einem Durchgang.
+        """
+        try:
+            blocks = [self.audio_queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+
+        try:
+            while True:
+                blocks.append(self.audio_queue.get_nowait())
+        except queue.Empty:
+            pass
+        return blocks
+
     def set_open_ai_key(self):
         """Gibt den OpenAI API Key aus der Umgebungsvariable zurück."""
         load_dotenv()
@@ -129,10 +282,39 @@ class SpeechRecorder(LoggingMixin):
     
     
         
+@lru_cache(maxsize=32)
+def build_transcription_prompt(language: str, vocabulary: Tuple[str, ...]) -> str:
+    """
+    Baut den Whisper-Prompt für Sprache und Vokabular einmalig auf; bei jeder
+    weiteren Transkription mit denselben Werten kommt er aus dem Cache.
+    """
+    prompt = ""
+    if language == "de":
+        prompt = "Dies ist eine Aufnahme auf Deutsch. "
+
+    vocab_str = ", ".join(vocabulary)
+    prompt += f"Folgende Wörter können vorkommen: {vocab_str}"
+    return prompt
+
+
 class AudioTranscriber(LoggingMixin):
     def __init__(self):
         super().__init__()
         self.openai = AsyncOpenAI()
+        # Eigener Thread für blockierende Dateizugriffe der Transkription, damit
+        # sie nicht mit anderen Aufgaben im Standard-Executor konkurrieren
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper")
+
+    async def warm_up(self) -> None:
+        """
+        Baut Client und HTTPS-Verbindung zur OpenAI API vorab auf, damit die
+        erste Transkription nicht die Kaltstartkosten trägt.
+        """
+        try:
+            await self.openai.models.retrieve("whisper-1")
+            self.logger.info("🔥 Whisper-Verbindung vorgewärmt")
+        except Exception as e:
+            self.logger.warning(f"⚠️ Vorwärmen der Whisper-Verbindung fehlgeschlagen: {e}")
 
     @measure_performance
     async def transcribe_audio(
@@ -145,17 +327,14 @@ class AudioTranscriber(LoggingMixin):
 
         try:
             file_basename = os.path.basename(filename)
+            prompt = build_transcription_prompt(language, tuple(vocabulary))
 
-            prompt = ""
-            if language == "de":
-                prompt = "Dies ist eine Aufnahme auf Deutsch. "
-                
-            vocab_str = ", ".join(vocabulary)
-            prompt += f"Folgende Wörter können vorkommen: {vocab_str}"
+            # Ein einziger Thread-Wechsel statt je einem für open, read und close
+            loop = asyncio.get_running_loop()
+            audio_data = await loop.run_in_executor(
+                self._executor, Path(filename).read_bytes
+            )
 
-            async with aiofiles.open(filename, "rb") as audio_file:
-                audio_data = await audio_file.read()
-                
             transcription = await self.openai.audio.transcriptions.create(
                 model="whisper-1",
                 file=(file_basename, audio_data),
@@ -1,8 +1,12 @@
+import threading
+
+from graphs.core.workflow_dispatcher import WorkflowDispatcher
 from integrations.phillips_hue.bridge import HueBridge
 from integrations.phillips_hue.light_controller import LightController
 from integrations.spotify.spotify_api import SpotifyPlaybackController
 from service.human_speech import AudioTranscriber, SpeechRecorder
 from service.speech_service import SpeechService
+from service.tts_generator import get_tts_generator
 from service.wake_word_listener import WakeWordListener
 
 # Hier will ich eigentlich eine config, die es mir auch erlaubt die Lichter, Spotify-Clients etc. zuzugreifen
@@ -10,12 +14,18 @@ from service.wake_word_listener import WakeWordListener
 
 class ServiceLocator:
     _instance = None
+    _lock = threading.Lock()
     
     @classmethod
     def get_instance(cls) -> 'ServiceLocator':
         if cls._instance is None:
-            cls._instance = cls()
-            cls._instance.initialize_all_services()
+            with cls._lock:
+                # Erneut prüfen, da ein anderer Thread die Services inzwischen
+                # initialisiert haben kann; veröffentlicht wird erst danach.
+                if cls._instance is None:
+                    instance = cls()
+                    instance.initialize_all_services()
+                    cls._instance = instance
         return cls._instance
     
     def __init__(self):
@@ -27,6 +37,8 @@ class ServiceLocator:
         self.speech_recorder = SpeechRecorder()
         self.audio_transcriber = AudioTranscriber()
         self.speech_service = SpeechService()
+        # Räumt nur die temporären TTS-Antworten auf, nie mitgelieferte Sounds
+        get_tts_generator().start_cleanup()
         
         bridge = HueBridge.connect_by_ip()
         self.lighting_controller = LightController(bridge)
@@ -35,6 +47,10 @@ class ServiceLocator:
         
         self.wake_word_listener = WakeWordListener()
         
+        # Der Dispatcher kompiliert seinen Graphen und startet einen eigenen
+        # SpeechService, daher einmal beim Start statt pro Anfrage
+        self.workflow_dispatcher = WorkflowDispatcher()
+        
     
     def get_speech_service(self) -> 'SpeechService':
         return self.speech_service
@@ -51,5 +67,5 @@ class ServiceLocator:
     def get_wake_word_listener(self) -> 'WakeWordListener':
         return self.wake_word_listener
     
-
-service_locator = ServiceLocator.get_instance()
\ No newline at end of file
+    def get_workflow_dispatcher(self) -> 'WorkflowDispatcher':
+        return self.workflow_dispatcher
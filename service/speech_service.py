@@ -1,20 +1,40 @@
+import heapq
 import os
 import queue
+import re
 import threading
 import time
-from datetime import datetime, timedelta
-from typing import Dict, Optional
+import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
 
 from singleton_decorator import singleton
 
 from audio.strategy.audio_manager import get_audio_manager
 from service.tts_generator import get_tts_generator
-from util.decorator import log_exceptions_from_self_logger, non_blocking
+from util.decorator import log_exceptions_from_self_logger
 from util.loggin_mixin import LoggingMixin
+from util.lru_k_cache import LRUKCache
+
+# Trennt nach Satzzeichen, damit jeder Satz einzeln vertont werden kann
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
 
 
 @singleton
 class SpeechService(LoggingMixin):
+    # Kurze Sätze werden mit bereits wartenden zu einer TTS-Anfrage
+    # zusammengefasst, bis diese Länge erreicht ist
+    MIN_TTS_CHARS = 60
+    # Parallele TTS-Anfragen; die Wiedergabe bleibt über Sequenznummern geordnet
+    TTS_WORKERS = 3
+    # Wie viele Sätze die Vertonung der Wiedergabe voraus sein darf,
+    # einschließlich des gerade laufenden
+    PREFETCH_WINDOW = 3
+    # Identische Antworten innerhalb dieses Zeitfensters (Sekunden) werden
+    # nur einmal vertont, z. B. bei doppelt ausgelösten Callbacks
+    ENQUEUE_DEDUP_WINDOW = 0.5
+
     def __init__(
         self,
         voice: str = "nova",
@@ -33,23 +53,53 @@ class SpeechService(LoggingMixin):
         self.tts_generator = get_tts_generator()
         self.audio_manager = get_audio_manager()
 
-        self.tts_generator.set_category_path(category, cache_dir)
+        self.tts_generator.set_category_path(category, cache_dir, temporary=True)
 
         self.cache_cleaner = AudioCacheCleaner(cache_dir, cache_cleanup_interval)
 
         self.tts_generator.load_existing_cache(category)
 
-        self._audio_lock = threading.Lock()
-
-        self.text_queue = queue.Queue()
-        self.audio_queue = queue.Queue()
+        # Wird bei jeder Unterbrechung erhöht; der Wiedergabe-Worker verwirft
+        # Dateien, die er vor der Unterbrechung entnommen hat, ohne Lock
+        self._play_generation = 0
+
+        self.text_queue = queue.SimpleQueue()
+        # Wiedergabe-Queue als deque unter einer Condition; ihre Länge begrenzt
+        # bereits PREFETCH_WINDOW, Leeren erfolgt in einem Schritt unter dem Lock
+        self.audio_queue: deque = deque()
+        self._audio_cv = threading.Condition()
+
+        # Fertige TTS-Ergebnisse werden nach Sequenznummer in die Wiedergabe
+        # übernommen; eine Unterbrechung erhöht die Generation und verwirft
+        # so Ergebnisse, die noch zu alten Texten gehören.
+        self._tts_executor = ThreadPoolExecutor(
+            max_workers=self.TTS_WORKERS, thread_name_prefix="tts"
+        )
+        self._order_lock = threading.Lock()
+        # Hält den TTS-Worker an, solange PREFETCH_WINDOW Sätze vergeben,
+        # aber noch nicht abgespielt oder verworfen sind
+        self._window_cv = threading.Condition(self._order_lock)
+        self._generation = 0
+        self._next_seq = 0
+        self._next_to_play = 0
+        self._consumed_seq = 0
+        self._ready: Dict[int, Optional[str]] = {}
+
+        # (Text, Stimme) -> Sound-ID; spart bei wiederkehrenden Antworten den
+        # Weg über Hash und Dateisystem im TTSGenerator
+        self._id_cache: LRUKCache[Tuple[str, str], str] = LRUKCache(capacity=256, k=2)
+
+        # Zuletzt eingereihter Text samt Zeitpunkt für die Duplikatprüfung
+        self._last_enqueue: Tuple[str, float] = ("", 0.0)
 
         self.active = True
-        self.tts_worker = threading.Thread(target=self._process_tts_queue, daemon=True)
+        self.tts_worker = threading.Thread(
+            target=self._supervise, args=(self._process_tts_queue,), daemon=True
+        )
         self.tts_worker.start()
 
         self.playback_worker = threading.Thread(
-            target=self._process_audio_queue, daemon=True
+            target=self._supervise, args=(self._process_audio_queue,), daemon=True
         )
         self.playback_worker.start()
 
@@ -58,93 +108,234 @@ class SpeechService(LoggingMixin):
             f"Kategorie '{category}' und Cache-Verzeichnis '{cache_dir}'"
         )
 
+    def _supervise(self, worker: Callable[[], None]) -> None:
+        """
+        Führt eine Worker-Schleife aus und startet sie neu, falls sie vor dem
+        Herunterfahren endet. Die Schleifen loggen ihre Fehler selbst und
+        kehren dann zurück, statt den Thread still sterben zu lassen.
+        """
+        while True:
+            worker()
+            if not self.active:
+                break
+            self.logger.warning("⚠️ %s unerwartet beendet, starte neu", worker.__name__)
+
     @log_exceptions_from_self_logger("bei der TTS-Verarbeitung")
     def _process_tts_queue(self) -> None:
-        """Worker-Thread, der Texte in Audio umwandelt und zur Wiedergabe vorbereitet"""
-        while self.active:
-            try:
-                text = self.text_queue.get(timeout=0.5)
-
-                if not text.strip():
-                    self.text_queue.task_done()
+        """
+        Worker-Thread, der Texte entnimmt und ihre Vertonung an den
+        TTS-Executor verteilt
+        """
+        # Lokale Bindungen sparen die Attribut-Auflösung in jedem Durchlauf
+        get_text = self.text_queue.get
+        coalesce = self._coalesce_pending
+        window_cv = self._window_cv
+        window_open = self._prefetch_window_open
+        submit = self._tts_executor.submit
+        generate = self._generate_speech
+
+        stopping = False
+        while not stopping:
+            # Blockiert ohne Polling; shutdown() weckt den Thread mit None auf
+            text = get_text()
+            if text is None:
+                break
+            generation = self._generation
+
+            text, stopping = coalesce(text)
+
+            if not text.strip():
+                continue
+
+            # Gegendruck statt unbegrenzter Vorausberechnung: warten, bis die
+            # Wiedergabe wieder Platz im Vorausfenster hat
+            with window_cv:
+                window_cv.wait_for(window_open)
+                if not self.active:
+                    break
+                # Während des Wartens unterbrochen: Text gehört zur alten Antwort
+                if generation != self._generation:
                     continue
+                seq = self._next_seq
+                self._next_seq += 1
 
-                self.logger.debug(
-                    "Generiere Sprache für: %s",
-                    text[:50] + ("..." if len(text) > 50 else ""),
-                )
+            submit(generate, seq, generation, text)
+
+    def _prefetch_window_open(self) -> bool:
+        return (
+            self._next_seq - self._consumed_seq < self.PREFETCH_WINDOW
+            or not self.active
+        )
+
+    def _consume_seq(self) -> None:
+        """Gibt nach Wiedergabe oder Verwerfen eines Satzes einen Platz im Vorausfenster frei."""
+        with self._window_cv:
+            self._consume_seq_locked()
+
+    def _consume_seq_locked(self) -> None:
+        self._consumed_seq = min(self._consumed_seq + 1, self._next_seq)
+        self._window_cv.notify()
+
+    @log_exceptions_from_self_logger("bei der TTS-Generierung")
+    def _generate_speech(self, seq: int, generation: int, text: str) -> None:
+        """Vertont einen Text in einem Executor-Thread."""
+        sound_id = None
+        try:
+            # Wartete die Aufgabe im Executor über eine Unterbrechung hinweg,
+            # wird die TTS-Anfrage gar nicht erst gestellt
+            if generation != self._generation:
+                return
+
+            sound_id = self._lookup_sound_id(text)
+            if sound_id is None:
+                self.logger.debug("Generiere Sprache für: %.50s", text)
 
                 sound_id = self.tts_generator.generate_tts(
                     text, self.category, self.voice
                 )
-
                 if sound_id:
-                    self.cache_cleaner.protect_file(sound_id, 30)
-                    self.audio_queue.put(sound_id)
+                    self._id_cache.put((text, self.voice), sound_id)
+        finally:
+            # Auch bei Fehlern abschließen, sonst blockiert die Lücke alle
+            # nachfolgenden Sequenznummern
+            self._complete(seq, generation, sound_id)
 
-                self.text_queue.task_done()
+    def _lookup_sound_id(self, text: str) -> Optional[str]:
+        """
+        Sucht die Sound-ID im LRU-K-Cache. Wurde die Datei inzwischen vom
+        Cleanup entfernt, wird der Eintrag verworfen.
+        """
+        key = (text, self.voice)
+        sound_id = self._id_cache.get(key)
+        if sound_id is not None and sound_id not in self.audio_manager.sound_map:
+            self._id_cache.discard(key)
+            return None
+        return sound_id
+
+    def _complete(self, seq: int, generation: int, sound_id: Optional[str]) -> None:
+        """
+        Merkt sich ein fertiges Ergebnis und reicht alle lückenlos
+        aufeinanderfolgenden Ergebnisse in Reihenfolge an die Wiedergabe weiter.
+        """
+        with self._order_lock:
+            if generation != self._generation:
+                return
+
+            self._ready[seq] = sound_id
+            while self._next_to_play in self._ready:
+                next_sound = self._ready.pop(self._next_to_play)
+                self._next_to_play += 1
+                if next_sound:
+                    self.cache_cleaner.protect_file(next_sound, 30)
+                    self._put_audio(next_sound)
+                else:
+                    self._consume_seq_locked()
 
+    def _coalesce_pending(self, text: str) -> Tuple[str, bool]:
+        """
+        Hängt bereits wartende Sätze an einen zu kurzen Text an, damit sehr
+        kurze Sätze keine eigene TTS-Anfrage samt Pause auslösen. Liefert
+        den Text und ob dabei das Shutdown-Signal entnommen wurde.
+        """
+        while len(text) < self.MIN_TTS_CHARS:
+            try:
+                pending = self.text_queue.get_nowait()
             except queue.Empty:
-                pass
+                break
+
+            if pending is None:
+                return text, True
+
+            text = f"{text} {pending}"
+
+        return text, False
+
+    def _put_audio(self, sound_id: str) -> None:
+        """
+        Reiht eine Audiodatei zur Wiedergabe ein. Wird nur mit gehaltenem
+        _order_lock aufgerufen.
+        """
+        with self._audio_cv:
+            self.audio_queue.append(sound_id)
+            self._audio_cv.notify()
 
     @log_exceptions_from_self_logger("bei der Audio-Wiedergabe")
     def _process_audio_queue(self) -> None:
         """Worker-Thread, der vorbereitete Audiodateien abspielt"""
-        while self.active:
-            try:
-                sound_id = self.audio_queue.get(timeout=0.5)
-
-                self.logger.debug("Spiele Audio ab: %s", sound_id)
+        while True:
+            with self._audio_cv:
+                self._audio_cv.wait_for(lambda: self.audio_queue or not self.active)
+                if not self.active:
+                    break
+                sound_id = self.audio_queue.popleft()
+                generation = self._play_generation
 
-                self.cache_cleaner.protect_file(sound_id, 60)
+            self.cache_cleaner.protect_file(sound_id, 60)
 
-                with self._audio_lock:
-                    self.audio_manager.play(sound_id, block=True)
+            # Zwischen Entnahme und Start unterbrochen: nicht mehr abspielen
+            if generation != self._play_generation:
+                continue
 
-                self.audio_queue.task_done()
+            self.logger.debug("Spiele Audio ab: %s", sound_id)
 
-            except queue.Empty:
-                pass
+            # Nur ein Wiedergabe-Worker: play braucht keinen eigenen Lock,
+            # stop() im AudioManager beendet die blockierende Wiedergabe
+            try:
+                self.audio_manager.play(sound_id, block=True)
+            finally:
+                # Auch bei einem Fehler den Platz im Vorausfenster freigeben,
+                # sonst bleibt der neu gestartete Worker dauerhaft gedrosselt
+                if generation != self._play_generation:
+                    self.logger.debug("Wiedergabe unterbrochen: %s", sound_id)
+                else:
+                    self._consume_seq()
     
-    @non_blocking
     @log_exceptions_from_self_logger("beim Unterbrechen der Audioausgabe")
     def interrupt_and_reset(self) -> bool:
         """
-        Unterbricht die aktuelle Sprachausgabe und leert die Queues.
+        Unterbricht die aktuelle Sprachausgabe und leert die Queues. Wartet
+        auf keinen Lock; nur das Stoppen im AudioManager kann blockieren.
 
         Returns:
             bool: True, wenn erfolgreich zurückgesetzt
         """
         self.logger.debug("Unterbreche aktuelle Audioausgabe...")
 
-        # Leere Queues sicher
+        # Erst die Generation erhöhen, damit bereits entnommene Dateien nicht
+        # mehr starten, dann Queues leeren und den laufenden Sound stoppen
+        self._play_generation += 1
         self._clear_queues()
+        self.audio_manager.stop()
 
-        # Versuche Lock zu erwerben mit Timeout
-        if self._audio_lock.acquire(timeout=1.0):
-            try:
-                # Stoppe alle laufenden Sounds über den AudioManager
-                self.audio_manager.stop()
+        self.logger.info("System bereit für neue Eingabe")
+        return True
 
-                self.logger.info("System bereit für neue Eingabe")
-                return True
-            finally:
-                self._audio_lock.release()
-        else:
-            # Notfall-Reset bei Lock-Timeout
-            self.logger.warning(
-                "Konnte Audio-Lock nicht erwerben, versuche alternative Stopstrategie"
-            )
-            self.audio_manager.stop()  # Stopp-Versuch ohne Lock
-            return True
-
-    @log_exceptions_from_self_logger("beim Leeren der Queues")
     def _clear_queues(self) -> None:
         """Leert alle Aufgaben-Queues sicher"""
-        with self.text_queue.mutex:
-            self.text_queue.queue.clear()
-        with self.audio_queue.mutex:
-            self.audio_queue.queue.clear()
+        # Nicht blockierendes Entleeren; ein dabei entnommenes Shutdown-Signal
+        # wird wieder eingereiht, damit der TTS-Worker trotzdem endet
+        saw_sentinel = False
+        while True:
+            try:
+                if self.text_queue.get_nowait() is None:
+                    saw_sentinel = True
+            except queue.Empty:
+                break
+
+        if saw_sentinel:
+            self.text_queue.put(None)
+
+        # Ergebnisse laufender TTS-Anfragen gehören zur alten Generation
+        # und geben ihre Plätze im Vorausfenster sofort frei
+        with self._window_cv:
+            self._generation += 1
+            self._ready.clear()
+            self._next_to_play = self._next_seq
+            self._consumed_seq = self._next_seq
+            self._window_cv.notify()
+
+        with self._audio_cv:
+            self.audio_queue.clear()
 
     def enqueue_text(self, response_text: str, is_interrupting=True) -> str:
         """
@@ -163,14 +354,24 @@ class SpeechService(LoggingMixin):
             self.logger.warning("Leere Antwort erhalten, keine Sprachausgabe")
             return ""
 
+        now = time.monotonic()
+        last_text, last_time = self._last_enqueue
+        self._last_enqueue = (response_text, now)
+        if response_text == last_text and now - last_time < self.ENQUEUE_DEDUP_WINDOW:
+            self.logger.debug("Doppelte Antwort ignoriert: %.50s", response_text)
+            return response_text
+
         if is_interrupting:
             self.interrupt_and_reset()
 
-        self.text_queue.put(response_text)
-        self.logger.info(
-            "Text zur Sprachausgabe hinzugefügt: %s",
-            response_text[:50] + ("..." if len(response_text) > 50 else ""),
-        )
+        # Jeder Satz wird einzeln vertont: der erste Satz spielt bereits ab,
+        # während der TTS-Worker noch die folgenden erzeugt.
+        for sentence in SENTENCE_BOUNDARY.split(response_text.strip()):
+            if sentence:
+                self.text_queue.put(sentence)
+
+        # %.50s kürzt erst beim Formatieren, also nur wenn der Eintrag ausgegeben wird
+        self.logger.info("Text zur Sprachausgabe hinzugefügt: %.50s", response_text)
 
         return response_text
         
@@ -189,6 +390,11 @@ class SpeechService(LoggingMixin):
     def shutdown(self) -> None:
         """Fährt den SpeechService ordnungsgemäß herunter"""
         self.active = False
+        self.text_queue.put(None)
+        with self._audio_cv:
+            self._audio_cv.notify_all()
+        with self._window_cv:
+            self._window_cv.notify_all()
         
         # CacheCleaner herunterfahren
         if hasattr(self, 'cache_cleaner'):
@@ -197,6 +403,9 @@ class SpeechService(LoggingMixin):
         # Warten auf das Beenden der Worker-Threads
         if hasattr(self, 'tts_worker') and self.tts_worker.is_alive():
             self.tts_worker.join(timeout=1.0)
+
+        if hasattr(self, '_tts_executor'):
+            self._tts_executor.shutdown(wait=False, cancel_futures=True)
             
         if hasattr(self, 'playback_worker') and self.playback_worker.is_alive():
             self.playback_worker.join(timeout=1.0)
@@ -226,7 +435,8 @@ class AudioCacheCleaner(LoggingMixin):
         self,
         cache_dir: str,
         default_cleanup_interval: int = 3600,
-        file_extension: str = ".mp3"
+        file_extension: str = ".mp3",
+        max_protected: int = 1024,
     ):
         """
         Initialisiert den AudioCacheCleaner zur Verwaltung von temporären Audiodateien.
@@ -240,13 +450,37 @@ class AudioCacheCleaner(LoggingMixin):
         os.makedirs(self.cache_dir, exist_ok=True)
         
         # Verwaltung aktiver Audiodateien und deren Schutzzeiten
-        self._protected_files: Dict[str, datetime] = {}
+        # Ablaufzeitpunkte als monotone Zeitstempel; der Heap ordnet sie nach
+        # Ablauf, damit beim Aufräumen nicht das ganze Dict durchsucht wird.
+        # Veraltete Heap-Einträge nach einer Verlängerung werden beim Entnehmen
+        # übersprungen.
+        # Das OrderedDict ist auf _max_protected Einträge begrenzt; verdrängte
+        # Dateien werden lediglich früher wieder für das Cleanup freigegeben.
+        self._protected_files: "OrderedDict[str, float]" = OrderedDict()
+        self._protected_heap: List[Tuple[float, str]] = []
+        self._max_protected = max_protected
         self._cleanup_lock = threading.Lock()
         
         # Cleanup-Thread starten
         self._cleanup_active = True
+        self._shutdown_event = threading.Event()
         self._cleanup_thread = threading.Thread(target=self._scheduled_cleanup, daemon=True)
         self._cleanup_thread.start()
+
+        # Ersetzt __del__: läuft genau einmal, spätestens beim Beenden des
+        # Interpreters, und hält selbst keine Referenz auf diese Instanz
+        self._finalizer = weakref.finalize(
+            self,
+            AudioCacheCleaner._do_shutdown,
+            self.logger,
+            self._shutdown_event,
+            weakref.ref(self._cleanup_thread),
+            self.cache_dir,
+            self.file_extension,
+            self._cleanup_lock,
+            self._protected_files,
+            self._protected_heap,
+        )
         
         self.logger.info(
             f"AudioCacheCleaner initialisiert für Verzeichnis '{cache_dir}' "
@@ -259,19 +493,44 @@ class AudioCacheCleaner(LoggingMixin):
         """
         # Nur Dateiname ohne Pfad verwenden
         basename = os.path.basename(filename)
+        expiry_time = time.monotonic() + duration_seconds
+
+        # Häufiger Fall bei erneutem Schutz: die bestehende Schutzzeit reicht
+        # bereits, dann ohne Lock zurückkehren (einzelner Dict-Lesezugriff)
+        existing_expiry = self._protected_files.get(basename)
+        if existing_expiry is not None and existing_expiry >= expiry_time:
+            return
         
         with self._cleanup_lock:
-            current_time = datetime.now()
-            expiry_time = current_time + timedelta(seconds=duration_seconds)
-            
             if basename in self._protected_files:
                 existing_expiry = self._protected_files[basename]
                 if expiry_time > existing_expiry:
                     self._protected_files[basename] = expiry_time
-                    self.logger.debug(f"Schutzzeit für {basename} verlängert bis {expiry_time}")
+                    self._protected_files.move_to_end(basename)
+                    heapq.heappush(self._protected_heap, (expiry_time, basename))
+                    self.logger.debug("Schutzzeit für %s um %ss verlängert", basename, duration_seconds)
             else:
                 self._protected_files[basename] = expiry_time
-                self.logger.debug(f"Datei {basename} geschützt bis {expiry_time}")
+                heapq.heappush(self._protected_heap, (expiry_time, basename))
+                self.logger.debug("Datei %s für %ss geschützt", basename, duration_seconds)
+
+            self._evict_protected_files()
+
+    def _evict_protected_files(self) -> None:
+        """
+        Begrenzt die Anzahl geschützter Dateien, indem die am längsten nicht
+        erneuerten Einträge verdrängt werden. Erwartet den gehaltenen Lock.
+        """
+        while len(self._protected_files) > self._max_protected:
+            self._protected_files.popitem(last=False)
+
+        # Veraltete Heap-Einträge nicht unbegrenzt ansammeln lassen
+        if len(self._protected_heap) > 2 * self._max_protected:
+            self._protected_heap[:] = [
+                (expiry_time, filename)
+                for filename, expiry_time in self._protected_files.items()
+            ]
+            heapq.heapify(self._protected_heap)
 
     def is_protected(self, filename: str) -> bool:
         """
@@ -280,16 +539,10 @@ class AudioCacheCleaner(LoggingMixin):
         """
         basename = os.path.basename(filename)
         
+        # Reiner Float-Vergleich mit der monotonen Uhr; abgelaufene Einträge
+        # räumt _update_protected_files über den Heap ab.
         with self._cleanup_lock:
-            # Prüfen, ob Datei in der Liste ist und Schutzzeit noch nicht abgelaufen
-            if basename in self._protected_files:
-                if self._protected_files[basename] > datetime.now():
-                    return True
-                else:
-                    # Abgelaufenen Schutz entfernen
-                    del self._protected_files[basename]
-            
-            return False
+            return self._protected_files.get(basename, 0.0) > time.monotonic()
 
     @log_exceptions_from_self_logger("beim Cache-Cleanup")
     def cleanup_cache(self, max_age_seconds: Optional[int] = None) -> int:
@@ -311,28 +564,41 @@ class AudioCacheCleaner(LoggingMixin):
         
         try:
             with self._cleanup_lock:
-                # Aktualisiere Liste geschützter Dateien
+                # Aktualisiere Liste geschützter Dateien; danach sind alle
+                # verbliebenen Einträge noch gültig und werden einmal erfasst.
+                # is_protected() würde hier den bereits gehaltenen Lock erneut
+                # anfordern und blockieren.
                 self._update_protected_files()
-                
-                # Alle Dateien im Cache-Verzeichnis durchgehen
-                for filename in os.listdir(self.cache_dir):
+                protected = set(self._protected_files)
+
+            # Das Löschen läuft ohne Lock, damit protect_file und is_protected
+            # auf dem Wiedergabepfad nicht auf Dateisystemzugriffe warten.
+            # Neu geschützte Dateien entstehen vor ihrem Schutz und fehlen im
+            # Snapshot höchstens, wenn sie ohnehin gerade erst erzeugt wurden.
+            # Ein scandir-Durchlauf liefert Name, Pfad und stat-Daten je
+            # Eintrag, statt listdir plus join und getmtime pro Datei
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    filename = entry.name
                     if not filename.endswith(self.file_extension):
                         continue
-                        
-                    file_path = os.path.join(self.cache_dir, filename)
-                    
+
                     # Prüfen, ob Datei geschützt ist
-                    if self.is_protected(filename):
-                        self.logger.debug(f"Datei {filename} ist geschützt, wird übersprungen")
+                    if filename in protected:
+                        self.logger.debug("Datei %s ist geschützt, wird übersprungen", filename)
                         continue
-                    
+
                     # Prüfen, ob Datei alt genug ist, um gelöscht zu werden
-                    file_age = current_time - os.path.getmtime(file_path)
+                    try:
+                        file_age = current_time - entry.stat().st_mtime
+                    except OSError:
+                        continue
+
                     if file_age > max_age_seconds:
                         try:
-                            os.remove(file_path)
+                            os.remove(entry.path)
                             deleted_count += 1
-                            self.logger.debug(f"Gelöschte Audiodatei: {filename} (Alter: {file_age:.1f}s)")
+                            self.logger.debug("Gelöschte Audiodatei: %s (Alter: %.1fs)", filename, file_age)
                         except (OSError, PermissionError) as e:
                             self.logger.warning(f"Konnte Datei {filename} nicht löschen: {e}")
             
@@ -345,59 +611,76 @@ class AudioCacheCleaner(LoggingMixin):
 
     def _update_protected_files(self) -> None:
         """Entfernt abgelaufene Einträge aus der Liste geschützter Dateien"""
-        current_time = datetime.now()
-        expired_files = [
-            filename for filename, expiry_time in self._protected_files.items() 
-            if expiry_time <= current_time
-        ]
+        current_time = time.monotonic()
+        heap = self._protected_heap
+        expired_count = 0
         
-        for filename in expired_files:
-            del self._protected_files[filename]
+        while heap and heap[0][0] <= current_time:
+            expiry_time, filename = heapq.heappop(heap)
+            # Nur entfernen, wenn der Eintrag nicht inzwischen verlängert wurde
+            if self._protected_files.get(filename) == expiry_time:
+                del self._protected_files[filename]
+                expired_count += 1
             
-        if expired_files:
-            self.logger.debug(f"Schutz für {len(expired_files)} Dateien abgelaufen")
+        if expired_count:
+            self.logger.debug("Schutz für %d Dateien abgelaufen", expired_count)
 
     def _scheduled_cleanup(self) -> None:
         """Thread-Funktion für regelmäßiges Bereinigen des Cache-Verzeichnisses"""
-        while self._cleanup_active:
-            try:
-                # Warte für das konfigurierte Intervall
-                time.sleep(self.default_cleanup_interval)
-                
-                # Führe Cleanup durch
-                self.cleanup_cache()
-                
-            except Exception as e:
-                self.logger.error(f"Fehler im Cleanup-Thread: {e}")
+        # Wartet das Intervall ab, wacht aber sofort auf, wenn shutdown() das
+        # Event setzt; cleanup_cache fängt seine Fehler selbst ab.
+        while not self._shutdown_event.wait(self.default_cleanup_interval):
+            self.cleanup_cache()
 
     def shutdown(self) -> None:
         """
         Beendet den Cleanup-Thread ordnungsgemäß und löscht alle Dateien im Cache-Verzeichnis.
         """
-        # Zuerst den Cleanup-Thread stoppen
         self._cleanup_active = False
-        if self._cleanup_thread.is_alive():
-            self._cleanup_thread.join(timeout=1.0)
+        self._finalizer()
+
+    @staticmethod
+    def _do_shutdown(
+        logger,
+        shutdown_event: threading.Event,
+        cleanup_thread_ref: "weakref.ReferenceType[threading.Thread]",
+        cache_dir: str,
+        file_extension: str,
+        cleanup_lock: threading.Lock,
+        protected_files: Dict[str, float],
+        protected_heap: List[Tuple[float, str]],
+    ) -> None:
+        """
+        Eigentliche Shutdown-Logik; bekommt alle Ressourcen als Argumente,
+        damit weakref.finalize sie ohne Referenz auf die Instanz aufrufen kann.
+        """
+        # Zuerst den Cleanup-Thread stoppen
+        shutdown_event.set()
+        cleanup_thread = cleanup_thread_ref()
+        if cleanup_thread is not None and cleanup_thread.is_alive():
+            cleanup_thread.join(timeout=1.0)
         
         # Alle Dateien im Cache-Verzeichnis löschen, unabhängig vom Schutzstatus
         try:
             deleted_count = 0
-            for filename in os.listdir(self.cache_dir):
-                if filename.endswith(self.file_extension):
-                    file_path = os.path.join(self.cache_dir, filename)
+            with os.scandir(cache_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(file_extension):
+                        continue
                     try:
-                        os.remove(file_path)
+                        os.remove(entry.path)
                         deleted_count += 1
                     except (OSError, PermissionError) as e:
-                        self.logger.warning(f"Konnte Datei {filename} beim Herunterfahren nicht löschen: {e}")
+                        logger.warning(f"Konnte Datei {entry.name} beim Herunterfahren nicht löschen: {e}")
             
             # Setze die Liste der geschützten Dateien zurück
-            with self._cleanup_lock:
-                self._protected_files.clear()
+            with cleanup_lock:
+                protected_files.clear()
+                protected_heap.clear()
                 
-            self.logger.info(f"AudioCacheCleaner heruntergefahren: {deleted_count} Audiodateien gelöscht")
+            logger.info(f"AudioCacheCleaner heruntergefahren: {deleted_count} Audiodateien gelöscht")
         except Exception as e:
-            self.logger.error(f"Fehler beim Aufräumen des Cache-Verzeichnisses beim Shutdown: {e}")
+            logger.error(f"Fehler beim Aufräumen des Cache-Verzeichnisses beim Shutdown: {e}")
 
     def __enter__(self):
         """Context Manager Entry-Point"""
@@ -406,10 +689,3 @@ class AudioCacheCleaner(LoggingMixin):
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context Manager Exit-Point"""
         self.shutdown()
-        
-    def __del__(self) -> None:
-        """Destruktor zum sicheren Beenden des Threads"""
-        try:
-            self.shutdown()
-        except Exception:
-            pass  # Ignoriere Fehler beim Herunterfahren im Destruktor
\ No newline at end of file
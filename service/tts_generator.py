@@ -1,14 +1,30 @@
 import hashlib
+import heapq
 import os
+import threading
 import time
-from typing import Dict, Optional, Tuple
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
 
-from openai import OpenAI
+from openai import OpenAI, RateLimitError
 from singleton_decorator import singleton
 
 from audio.strategy.audio_manager import get_audio_manager
+from config.settings import TTS_MODEL
 from util.decorator import log_exceptions_from_self_logger
 from util.loggin_mixin import LoggingMixin
+from util.rate_limiter import TokenBucket
+
+
+@lru_cache(maxsize=512)
+def text_hash(text: str) -> str:
+    """
+    Kurzer Hash eines Textes als Cache-Schlüssel. Die ersten 8 Hex-Zeichen des
+    MD5 stecken in den Namen der mitgelieferten Dateien und dürfen sich daher
+    nicht ändern; wiederholte Texte werden nicht erneut gehasht.
+    """
+    return hashlib.md5(text.encode("utf-8")).hexdigest()[:8]
 
 
 @singleton
@@ -18,9 +34,17 @@ class TTSGenerator(LoggingMixin):
     Stellt sicher, dass TTS-Dateien nur einmal generiert und wiederverwendet werden.
     """
 
-    def __init__(self, default_base_cache_dir="audio/sounds"):
+    STREAM_CHUNK_SIZE = 8192
+    RATE_LIMIT_RETRIES = 3
+    RATE_LIMIT_BACKOFF = 0.5
+
+    def __init__(self, default_base_cache_dir="audio/sounds", max_items: int = 64):
         """
         Initialisiert den TTS-Generator.
+
+        Args:
+            default_base_cache_dir: Basisverzeichnis für die TTS-Dateien
+            max_items: Maximale Anzahl gemerkter Texte pro Kategorie im Speicher
         """
         super().__init__()
         self.openai = OpenAI()
@@ -31,20 +55,45 @@ class TTSGenerator(LoggingMixin):
 
         self.audio_manager = get_audio_manager()
 
-        self._message_cache: Dict[str, Dict[str, str]] = {}
+        # Pro Kategorie ein LRU-begrenzter Cache Text-Hash -> Sound-ID; bei einem
+        # Fehltreffer greift weiterhin die Prüfung auf vorhandene Dateien.
+        self.max_items = max_items
+        self._message_cache: Dict[str, OrderedDict[str, str]] = {}
+        # Mehrere TTS-Threads greifen gleichzeitig auf den LRU-Cache zu
+        self._cache_lock = threading.Lock()
+
+        # Index Dateipfad -> Änderungszeit samt Heap nach Alter, damit das
+        # Cleanup nur die abgelaufenen Dateien anfasst statt jedes Verzeichnis
+        # zu durchsuchen; veraltete Heap-Einträge werden beim Entnehmen erkannt
+        self._cache_index: Dict[str, float] = {}
+        self._cache_heap: List[Tuple[float, str, str]] = []
 
         self._category_paths: Dict[str, str] = {}
+        # Nur diese Kategorien enthalten reine Laufzeit-Ausgaben und dürfen
+        # vom Cleanup gelöscht werden; mitgelieferte Sounds bleiben unberührt
+        self._temporary_categories: Set[str] = set()
+
+        # Drosselt TTS-Anfragen vorab, statt erst auf 429-Antworten zu reagieren
+        self._rate_limiter = TokenBucket(rate_per_min=60, burst=5)
 
         self._last_cleanup_time = time.time()
         self.cache_cleanup_interval = 3600
 
+        # Das Aufräumen läuft in einem eigenen Hintergrund-Thread und nie auf
+        # dem Pfad einer TTS-Anfrage; gestartet wird er über start_cleanup()
+        self._cleanup_stop = threading.Event()
+        self._cleanup_thread: Optional[threading.Thread] = None
+
         self.logger.info(
             f"TTS-Generator initialisiert mit Standard-Cache-Verzeichnis: {self.default_base_cache_dir}"
         )
 
-    def set_category_path(self, category: str, custom_path: str) -> None:
+    def set_category_path(
+        self, category: str, custom_path: str, temporary: bool = False
+    ) -> None:
         """
-        Setzt einen benutzerdefinierten Pfad für eine Kategorie.
+        Setzt einen benutzerdefinierten Pfad für eine Kategorie. Nur Kategorien
+        mit temporary=True werden von clean_old_cache_files aufgeräumt.
         """
         if not os.path.isabs(custom_path):
             abs_path = os.path.join(self.project_dir, custom_path)
@@ -52,6 +101,10 @@ class TTSGenerator(LoggingMixin):
             abs_path = custom_path
 
         self._category_paths[category] = abs_path
+        if temporary:
+            self._temporary_categories.add(category)
+        else:
+            self._temporary_categories.discard(category)
         os.makedirs(abs_path, exist_ok=True)
         self.logger.info(f"Kategorie '{category}' verwendet nun Pfad: {abs_path}")
 
@@ -63,7 +116,7 @@ class TTSGenerator(LoggingMixin):
         """
         Erzeugt einen konsistenten Hash für einen Text.
         """
-        return hashlib.md5(text.encode("utf-8")).hexdigest()[:8]
+        return text_hash(text)
 
     def _get_cache_dir(self, category: str) -> str:
         """
@@ -78,6 +131,20 @@ class TTSGenerator(LoggingMixin):
         os.makedirs(cache_dir, exist_ok=True)
         return cache_dir
 
+    def is_cached(self, text: str, category: str = "tts_responses") -> bool:
+        """
+        Prüft, ob für einen Text bereits eine TTS-Datei existiert, ohne sie
+        zu erzeugen.
+        """
+        text_hash = self._get_text_hash(text)
+        if text_hash in self._message_cache.get(category, ()):
+            return True
+
+        file_path = os.path.join(
+            self._get_cache_dir(category), f"tts_{category}_{text_hash}.mp3"
+        )
+        return os.path.exists(file_path)
+
     @log_exceptions_from_self_logger("bei der TTS-Generierung")
     def generate_tts(
         self, text: str, category: str = "tts_responses", voice: str = "nova"
@@ -90,12 +157,14 @@ class TTSGenerator(LoggingMixin):
 
         text_hash = self._get_text_hash(text)
 
-        if category not in self._message_cache:
-            self._message_cache[category] = {}
+        with self._cache_lock:
+            category_cache = self._message_cache.setdefault(category, OrderedDict())
+            sound_id = category_cache.get(text_hash)
+            if sound_id is not None:
+                category_cache.move_to_end(text_hash)
 
-        if text_hash in self._message_cache[category]:
-            sound_id = self._message_cache[category][text_hash]
-            self.logger.debug(f"Verwende gecachte TTS-Referenz: {sound_id}")
+        if sound_id is not None:
+            self.logger.debug("Verwende gecachte TTS-Referenz: %s", sound_id)
             return sound_id
 
         filename = f"tts_{category}_{text_hash}"
@@ -105,7 +174,8 @@ class TTSGenerator(LoggingMixin):
         if os.path.exists(file_path):
             self.logger.info(f"🔄 Verwende existierende TTS-Datei: {filename}")
 
-            self._message_cache[category][text_hash] = filename
+            self._remember(category, text_hash, filename)
+            self._index_file(file_path, category, os.path.getmtime(file_path))
 
             if filename not in self.audio_manager.sound_map:
                 abs_file_path = os.path.abspath(file_path)
@@ -113,19 +183,15 @@ class TTSGenerator(LoggingMixin):
 
             return filename
 
-        self.logger.info(f"🔊 Generiere neue TTS-Datei für Text: {text[:50]}...")
+        self.logger.info("🔊 Generiere neue TTS-Datei für Text: %.50s", text)
 
         try:
-            response = self.openai.audio.speech.create(
-                model="tts-1", voice=voice, input=text
-            )
-
-            with open(file_path, "wb") as f:
-                f.write(response.content)
+            self._synthesize(text, voice, file_path)
+            self._index_file(file_path, category, time.time())
 
             self.logger.info(f"✅ TTS-Datei gespeichert: {file_path}")
 
-            self._message_cache[category][text_hash] = filename
+            self._remember(category, text_hash, filename)
 
             abs_file_path = os.path.abspath(file_path)
             if not self.audio_manager.register_sound(filename, abs_file_path, category):
@@ -140,6 +206,91 @@ class TTSGenerator(LoggingMixin):
             self.logger.error(f"❌ Fehler bei TTS-Generierung: {e}")
             return None
 
+    def configure_rate(self, rate_per_min: float) -> None:
+        """Passt die Obergrenze für TTS-Anfragen pro Minute an."""
+        self._rate_limiter.configure_rate(rate_per_min)
+
+    def _synthesize(self, text: str, voice: str, file_path: str) -> None:
+        """
+        Lässt den Text von OpenAI vertonen und speichert das MP3. Bei einem
+        Rate-Limit wird mit exponentiell wachsender Pause erneut versucht.
+        """
+        for attempt in range(self.RATE_LIMIT_RETRIES):
+            self._rate_limiter.acquire()
+            try:
+                self._stream_to_file(text, voice, file_path)
+                return
+            except RateLimitError:
+                if attempt == self.RATE_LIMIT_RETRIES - 1:
+                    raise
+                backoff = self.RATE_LIMIT_BACKOFF * 2**attempt
+                self.logger.warning(
+                    f"⚠️ TTS-Rate-Limit erreicht, neuer Versuch in {backoff:.1f}s"
+                )
+                time.sleep(backoff)
+
+    def _stream_to_file(self, text: str, voice: str, file_path: str) -> None:
+        # Die Antwort wird in Blöcken direkt in eine temporäre Datei
+        # geschrieben, statt sie vollständig im Speicher zu sammeln; erst
+        # die fertige Datei erhält ihren endgültigen Namen.
+        partial_path = f"{file_path}.part"
+        with self.openai.audio.speech.with_streaming_response.create(
+            model=TTS_MODEL, voice=voice, input=text, response_format="mp3"
+        ) as response, open(partial_path, "wb") as f:
+            for chunk in response.iter_bytes(self.STREAM_CHUNK_SIZE):
+                f.write(chunk)
+
+        os.replace(partial_path, file_path)
+
+    def _remember(self, category: str, text_hash: str, sound_id: str) -> None:
+        """
+        Merkt sich eine Sound-ID im Kategorie-Cache und verdrängt den am
+        längsten nicht genutzten Eintrag, sobald max_items überschritten ist.
+        """
+        with self._cache_lock:
+            category_cache = self._message_cache.setdefault(category, OrderedDict())
+            category_cache[text_hash] = sound_id
+            category_cache.move_to_end(text_hash)
+
+            if len(category_cache) > self.max_items:
+                category_cache.popitem(last=False)
+
+    def _index_file(self, file_path: str, category: str, mtime: float) -> None:
+        """
+        Nimmt eine Cache-Datei mit ihrer Änderungszeit in den Alters-Index auf.
+        Dateien mitgelieferter Kategorien werden nie indiziert und damit nie
+        vom Cleanup gelöscht.
+        """
+        if category not in self._temporary_categories:
+            return
+
+        with self._cache_lock:
+            self._cache_index[file_path] = mtime
+            heapq.heappush(self._cache_heap, (mtime, file_path, category))
+
+    def _scheduled_cleanup(self) -> None:
+        """Thread-Funktion, die den TTS-Cache im festen Intervall bereinigt."""
+        while not self._cleanup_stop.wait(self.cache_cleanup_interval):
+            self.clean_old_cache_files()
+
+    def start_cleanup(self) -> None:
+        """Startet den Hintergrund-Thread für die Cache-Bereinigung."""
+        if self._cleanup_thread is not None and self._cleanup_thread.is_alive():
+            return
+
+        self._cleanup_stop.clear()
+        self._cleanup_thread = threading.Thread(
+            target=self._scheduled_cleanup, name="tts-cache-cleanup", daemon=True
+        )
+        self._cleanup_thread.start()
+
+    def stop_cleanup(self) -> None:
+        """Beendet den Hintergrund-Thread für die Cache-Bereinigung."""
+        self._cleanup_stop.set()
+        if self._cleanup_thread is not None:
+            self._cleanup_thread.join(timeout=1.0)
+            self._cleanup_thread = None
+
     @log_exceptions_from_self_logger("bei der Cache-Bereinigung")
     def clean_old_cache_files(self, max_age_seconds: int = None):
         """
@@ -162,71 +313,79 @@ class TTSGenerator(LoggingMixin):
 
         cleanup_time = current_time - max_age_seconds
 
-        self._clean_directory(self.default_base_cache_dir, cleanup_time)
-
-        for category, path in self._category_paths.items():
-            if os.path.exists(path) and os.path.isdir(path):
-                self._clean_directory(
-                    path, cleanup_time, is_category_dir=True, category_name=category
-                )
+        # Temporäre Kategorien werden beim Laden einmalig indiziert, danach
+        # genügt der Alters-Index; mitgelieferte Sounds werden nie angefasst
+        self._clean_indexed_files(cleanup_time)
 
         self._last_cleanup_time = current_time
         self.logger.info("🧹 Cache-Bereinigung abgeschlossen")
 
-    def _clean_directory(
-        self,
-        directory: str,
-        cleanup_time: float,
-        is_category_dir: bool = False,
-        category_name: str = None,
-    ):
+    def _clean_indexed_files(self, cleanup_time: float) -> None:
         """
-        Bereinigt ein Verzeichnis von alten Dateien.
+        Entnimmt abgelaufene Dateien vom Anfang des Alters-Heaps; Aufwand
+        proportional zur Zahl abgelaufener Dateien statt zur Cache-Größe.
         """
-        if not os.path.exists(directory):
-            return
-
-        if is_category_dir:
-            self._clean_category_dir(directory, cleanup_time, category_name)
-        else:
-            for category_dir in os.listdir(directory):
-                category_path = os.path.join(directory, category_dir)
-                if os.path.isdir(category_path):
-                    self._clean_category_dir(category_path, cleanup_time, category_dir)
-
-    def _clean_category_dir(
-        self, category_path: str, cleanup_time: float, category: str
-    ):
+        expired = []
+        with self._cache_lock:
+            heap = self._cache_heap
+            while heap and heap[0][0] < cleanup_time:
+                mtime, file_path, category = heapq.heappop(heap)
+                if category not in self._temporary_categories:
+                    continue
+                if self._cache_index.get(file_path) == mtime:
+                    del self._cache_index[file_path]
+                    expired.append((file_path, category))
+
+        self._remove_cache_files(expired)
+
+    def _remove_cache_files(self, files: List[Tuple[str, str]]) -> None:
         """
-        Bereinigt ein Kategorie-Verzeichnis.
+        Löscht mehrere Cache-Dateien (Pfad, Kategorie) in einem Durchgang und
+        entfernt alle Verweise darauf. Beide Locks werden je einmal für den
+        ganzen Stapel genommen statt einmal pro Datei.
         """
-        for filename in os.listdir(category_path):
-            if not filename.endswith(".mp3"):
-                continue
-
-            file_path = os.path.join(category_path, filename)
-            try:
-                file_mod_time = os.path.getmtime(file_path)
-
-                if file_mod_time < cleanup_time:
-                    sound_id = os.path.splitext(filename)[0]
+        if not files:
+            return
 
-                    if sound_id in self.audio_manager.sound_map:
-                        with self.audio_manager._lock:
-                            del self.audio_manager.sound_map[sound_id]
+        sound_ids = [
+            (os.path.splitext(os.path.basename(file_path))[0], category)
+            for file_path, category in files
+        ]
 
-                    os.remove(file_path)
-                    self.logger.debug(f"Gelöschte Cache-Datei: {file_path}")
+        sound_map = self.audio_manager.sound_map
+        with self.audio_manager._lock:
+            for sound_id, _ in sound_ids:
+                sound_map.pop(sound_id, None)
 
-                    if category in self._message_cache:
-                        for hash_key, cached_id in list(
-                            self._message_cache[category].items()
-                        ):
-                            if cached_id == sound_id:
-                                del self._message_cache[category][hash_key]
-                                break
+        for file_path, _ in files:
+            try:
+                os.remove(file_path)
+                self.logger.debug("Gelöschte Cache-Datei: %s", file_path)
+            except FileNotFoundError:
+                pass
             except Exception as e:
-                self.logger.error(f"Fehler beim Verarbeiten von {file_path}: {e}")
+                self.logger.error(f"Fehler beim Löschen von {file_path}: {e}")
+
+        with self._cache_lock:
+            # Umkehrindex Sound-ID -> Hash einmal pro Kategorie statt einer
+            # linearen Suche pro gelöschter Datei
+            reverse_indexes: Dict[str, Dict[str, str]] = {}
+            for sound_id, category in sound_ids:
+                category_cache = self._message_cache.get(category)
+                if not category_cache:
+                    continue
+
+                reverse = reverse_indexes.get(category)
+                if reverse is None:
+                    reverse = {
+                        cached_id: hash_key
+                        for hash_key, cached_id in category_cache.items()
+                    }
+                    reverse_indexes[category] = reverse
+
+                hash_key = reverse.get(sound_id)
+                if hash_key is not None:
+                    category_cache.pop(hash_key, None)
 
     @log_exceptions_from_self_logger("beim Laden des Caches")
     def load_existing_cache(self, category: str):
@@ -241,31 +400,32 @@ class TTSGenerator(LoggingMixin):
             )
             return
 
-        if category not in self._message_cache:
-            self._message_cache[category] = {}
-
         loaded_count = 0
 
-        for filename in os.listdir(cache_dir):
-            if not filename.endswith(".mp3"):
-                continue
+        # scandir liefert Name und Pfad in einem Verzeichnisdurchlauf, stat()
+        # wird auf dem Eintrag zwischengespeichert
+        with os.scandir(cache_dir) as entries:
+            for entry in entries:
+                filename = entry.name
+                if not filename.endswith(".mp3"):
+                    continue
 
-            parts = filename.split("_")
-            if len(parts) < 3:
-                continue
+                parts = filename.split("_")
+                if len(parts) < 3:
+                    continue
 
-            hash_part = parts[2].split(".")[0]
-            sound_id = os.path.splitext(filename)[0]
+                hash_part = parts[2].split(".")[0]
+                sound_id = filename[:-4]
 
-            self._message_cache[category][hash_part] = sound_id
+                self._remember(category, hash_part, sound_id)
 
-            file_path = os.path.join(cache_dir, filename)
-            abs_path = os.path.abspath(file_path)
+                self._index_file(entry.path, category, entry.stat().st_mtime)
 
-            if sound_id not in self.audio_manager.sound_map:
-                self.audio_manager.register_sound(sound_id, abs_path, category)
+                if sound_id not in self.audio_manager.sound_map:
+                    abs_path = os.path.abspath(entry.path)
+                    self.audio_manager.register_sound(sound_id, abs_path, category)
 
-            loaded_count += 1
+                loaded_count += 1
 
         self.logger.info(
             f"Geladen: {loaded_count} TTS-Einträge für Kategorie '{category}' aus {cache_dir}"
@@ -10,12 +10,18 @@ import pyaudio
 
 
 class WakeWordListener:
-    def __init__(self, wakeword="picovoice", sensitivity=0.8):
+    # Obergrenze, nach der ein wartendes listen_for_wakeword should_stop erneut prüft
+    STOP_CHECK_INTERVAL = 0.5
+
+    def __init__(self, wakeword="picovoice", sensitivity=0.8, coalesce_frames=2):
         self.logger = logging.getLogger(self.__class__.__name__)
 
         if not 0.0 <= sensitivity <= 1.0:
             raise ValueError("Sensitivity muss zwischen 0.0 und 1.0 liegen")
 
+        if coalesce_frames < 1:
+            raise ValueError("coalesce_frames muss mindestens 1 sein")
+
         self.logger.info(
             "🔧 Initialisiere Wake-Word Listener mit Wort: %s (Sensitivity: %.1f)",
             wakeword,
@@ -31,6 +37,10 @@ class WakeWordListener:
             access_key=access_key, keywords=[wakeword], sensitivities=[0.8]
         )
 
+        # Mehrere Porcupine-Frames pro Callback bündeln: weniger Callbacks und
+        # GIL-Übergaben aus dem PortAudio-Thread bei ~32 ms Zusatzlatenz je Frame
+        self.coalesce_frames = coalesce_frames
+
         # Separate PyAudio-Instanz für Input
         self.pa_input = pyaudio.PyAudio()
         self.stream = self.pa_input.open(
@@ -38,7 +48,7 @@ class WakeWordListener:
             channels=1,
             rate=16000,
             input=True,
-            frames_per_buffer=self.handle.frame_length,
+            frames_per_buffer=self.handle.frame_length * coalesce_frames,
             stream_callback=self._audio_callback,
         )
 
@@ -59,10 +69,11 @@ class WakeWordListener:
         """Callback für Audio-Processing"""
         if self.is_listening and not self.should_stop:
             pcm = np.frombuffer(in_data, dtype=np.int16)
-            keyword_index = self.handle.process(pcm)
 
-            if keyword_index >= 0:
-                self._detection_event.set()
+            for frame in pcm.reshape(-1, self.handle.frame_length):
+                if self.handle.process(frame) >= 0:
+                    self._detection_event.set()
+                    break
 
         return (in_data, pyaudio.paContinue)
 
@@ -73,18 +84,24 @@ class WakeWordListener:
         if not self.stream.is_active():
             self.stream.start_stream()
 
-        # Warten auf Erkennung
+        # Ein stop() vor dem clear() wäre verloren, daher wird should_stop bei
+        # jedem Durchlauf geprüft statt unbegrenzt auf das Event zu warten
         while not self.should_stop:
-            if self._detection_event.wait(timeout=0.1):
+            if self._detection_event.wait(self.STOP_CHECK_INTERVAL):
                 self._detection_event.clear()
-                return True
+                return not self.should_stop
 
         return False
 
-    def cleanup(self):
-        self.logger.info("🧹 Räume Wake-Word-Listener auf...")
+    def stop(self):
+        """Beendet ein laufendes listen_for_wakeword sofort, z. B. aus einem anderen Thread."""
         self.should_stop = True
         self.is_listening = False
+        self._detection_event.set()
+
+    def cleanup(self):
+        self.logger.info("🧹 Räume Wake-Word-Listener auf...")
+        self.stop()
 
         time.sleep(0.2)
 
@@ -1,9 +1,12 @@
 import asyncio
 import datetime
+import heapq
+import itertools
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Callable, Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 
 from singleton_decorator import singleton
 
@@ -26,8 +29,8 @@ class AlarmConfig:
     fade_out_duration: float = 2.0
     use_light_alarm: bool = True
     light_scene_name: str = "Majestätischer Morgen"
-    default_wake_up_sound = "wake-up-focus"
-    default_get_up_sound = "get-up-blossom"
+    default_wake_up_sound: str = DEFAULT_WAKE_SOUND
+    default_get_up_sound: str = DEFAULT_GET_UP_SOUND
 
 
 @singleton
@@ -35,9 +38,24 @@ class Alarm(LoggingMixin):
     def __init__(self, config: Optional[AlarmConfig] = None):
         self.current_alarm: Optional[AlarmItem] = None
         self.running: bool = False
+
+        # Min-Heap mit [monotone Weckzeit, Sequenznummer, Alarm]; ein abgebrochener
+        # Eintrag wird durch None an Stelle des Alarms markiert, sodass der
+        # Überwachungsthread nur die Heap-Einträge selbst lesen muss. Die Condition
+        # weckt ihn, sobald ein Alarm gesetzt oder abgebrochen wird.
+        self._heap: List[list] = []
+        self._current_entry: Optional[list] = None
+        self._tombstones = 0
+        self._cond = threading.Condition()
+        self._sequence = itertools.count()
+
         self.alarm_thread: Optional[threading.Thread] = None
+        # Unterbricht laufende Wartephasen eines ausgelösten Alarms beim Shutdown
+        self._stop_event = threading.Event()
         self.audio_manager = AudioManager()
 
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="alarm")
+
         self.config = config or AlarmConfig()
 
         self.light_controller: Optional[SceneBasedSunriseController] = None
@@ -73,9 +91,6 @@ class Alarm(LoggingMixin):
         light_scene: Optional[str] = None,
         callback: Optional[Callable] = None,
     ) -> int:
-        wake_sound_id = wake_sound_id or self.config.default_wake_up_sound
-        get_up_sound_id = get_up_sound_id or self.config.default_get_up_sound
-
         now = datetime.datetime.now()
         get_up_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
 
@@ -86,62 +101,47 @@ class Alarm(LoggingMixin):
             seconds=self.config.snooze_duration
         )
 
-        # Erstelle Einstellungen für den Alarm
-        extra_settings = {
-            "use_light": use_light and self.config.use_light_alarm,
-            "light_scene": light_scene or self.config.light_scene_name,
-        }
-
-        # Setze den Alarm
-        alarm = AlarmItem(
-            id=0,  # Immer ID 0, da nur ein Alarm
-            time=wake_up_time,
-            wake_sound_id=wake_sound_id,
-            get_up_sound_id=get_up_sound_id,
-            callback=callback,
-            extra=extra_settings,
+        return self._set_alarm(
+            wake_up_time, wake_sound_id, get_up_sound_id, use_light, light_scene, callback
         )
 
-        # Speichere den Alarm
-        self.current_alarm = alarm
-
-        get_up_time = wake_up_time + datetime.timedelta(
-            seconds=self.config.snooze_duration
-        )
-
-        # Protokolliere Details
-        self._log_alarm_details(alarm, get_up_time)
-
-        # Starte die Überwachung, falls noch nicht aktiv
-        if not self.running:
-            self._start_monitoring()
-
-        return 0  # Immer ID 0 zurückgeben
-
     def _log_alarm_details(
         self, alarm: AlarmItem, get_up_time: datetime.datetime
     ) -> None:
-        """Protokolliert Details zu einem gesetzten Alarm."""
-        self.logger.info(f"⏰ Alarm gesetzt:")
+        """
+        Protokolliert Details zu einem gesetzten Alarm.
+
+        Die Uhrzeiten werden aus den Integer-Feldern formatiert und erst vom
+        Logger zusammengesetzt, statt vorab strftime aufzurufen.
+        """
+        wake_time = alarm.time
+        self.logger.info("⏰ Alarm gesetzt:")
         self.logger.info(
-            "   Wake-Up: %s (Sound: %s)",
-            alarm.time.strftime("%H:%M:%S"),
+            "   Wake-Up: %02d:%02d:%02d (Sound: %s)",
+            wake_time.hour,
+            wake_time.minute,
+            wake_time.second,
             alarm.wake_sound_id,
         )
         self.logger.info(
-            f"   Get-Up: {get_up_time.strftime('%H:%M:%S')} (Sound: {alarm.get_up_sound_id})"
+            "   Get-Up: %02d:%02d:%02d (Sound: %s)",
+            get_up_time.hour,
+            get_up_time.minute,
+            get_up_time.second,
+            alarm.get_up_sound_id,
         )
 
         if alarm.extra.get("use_light", False):
             self.logger.info(
-                f"   Lichtwecker: Aktiv (Szene: {alarm.extra.get('light_scene', self.config.light_scene_name)})"
+                "   Lichtwecker: Aktiv (Szene: %s)",
+                alarm.extra.get("light_scene", self.config.light_scene_name),
             )
 
     def set_alarm_in(
         self,
         seconds: int,
-        wake_sound_id: str = DEFAULT_WAKE_SOUND,
-        get_up_sound_id: str = DEFAULT_GET_UP_SOUND,
+        wake_sound_id: Optional[str] = None,
+        get_up_sound_id: Optional[str] = None,
         callback: Optional[Callable] = None,
         use_light: bool = True,
         light_scene: Optional[str] = None,
@@ -160,16 +160,31 @@ class Alarm(LoggingMixin):
         Returns:
             int: ID des Alarms (immer 0)
         """
-        # Berechne die Alarmzeit
-        now = datetime.datetime.now()
-        wake_time = now + datetime.timedelta(seconds=seconds)
+        wake_time = datetime.datetime.now() + datetime.timedelta(seconds=seconds)
+
+        return self._set_alarm(
+            wake_time, wake_sound_id, get_up_sound_id, use_light, light_scene, callback
+        )
+
+    def _set_alarm(
+        self,
+        wake_time: datetime.datetime,
+        wake_sound_id: Optional[str],
+        get_up_sound_id: Optional[str],
+        use_light: bool,
+        light_scene: Optional[str],
+        callback: Optional[Callable],
+    ) -> int:
+        """
+        Erstellt, protokolliert und plant einen Alarm.
 
-        # Setze den Alarm (mit Standard-Sounds, falls nicht angegeben)
+        Nicht angegebene Sounds werden aus der Konfiguration ergänzt.
+        """
         alarm = AlarmItem(
-            id=0,  # Immer ID 0
+            id=0,  # Immer ID 0, da nur ein Alarm
             time=wake_time,
-            wake_sound_id=wake_sound_id,
-            get_up_sound_id=get_up_sound_id,
+            wake_sound_id=wake_sound_id or self.config.default_wake_up_sound,
+            get_up_sound_id=get_up_sound_id or self.config.default_get_up_sound,
             callback=callback,
             extra={
                 "use_light": use_light and self.config.use_light_alarm,
@@ -177,9 +192,6 @@ class Alarm(LoggingMixin):
             },
         )
 
-        # Speichere den Alarm
-        self.current_alarm = alarm
-
         get_up_time = wake_time + datetime.timedelta(
             seconds=self.config.snooze_duration
         )
@@ -187,11 +199,53 @@ class Alarm(LoggingMixin):
         # Protokolliere Details
         self._log_alarm_details(alarm, get_up_time)
 
+        self._schedule_alarm(alarm)
+
+        return 0  # Immer ID 0 zurückgeben
+
+    def _schedule_alarm(self, alarm: AlarmItem) -> None:
+        """
+        Ersetzt den aktuellen Alarm und weckt den Überwachungsthread.
+
+        Der vorherige Alarm wird nur als abgebrochen markiert und beim
+        Entnehmen aus dem Heap übersprungen.
+        """
+        with self._cond:
+            self._discard_current_entry()
+
+            self.current_alarm = alarm
+            self._current_entry = [
+                alarm.monotonic_deadline,
+                next(self._sequence),
+                alarm,
+            ]
+            heapq.heappush(self._heap, self._current_entry)
+            self._cond.notify()
+
         # Starte die Überwachung, falls noch nicht aktiv
         if not self.running:
             self._start_monitoring()
 
-        return 0  # Immer ID 0 zurückgeben
+    def _discard_current_entry(self) -> None:
+        """
+        Markiert den aktuellen Heap-Eintrag als abgebrochen.
+
+        Überwiegen die abgebrochenen Einträge, wird der Heap einmalig
+        verdichtet, statt einzelne Einträge herauszulösen.
+        """
+        entry = self._current_entry
+        self._current_entry = None
+
+        if entry is None or entry[2] is None or entry[2].triggered:
+            return
+
+        entry[2] = None
+        self._tombstones += 1
+
+        if self._tombstones * 2 > len(self._heap):
+            self._heap = [e for e in self._heap if e[2] is not None]
+            heapq.heapify(self._heap)
+            self._tombstones = 0
 
     def get_next_alarm_info(
         self,
@@ -221,10 +275,13 @@ class Alarm(LoggingMixin):
         Returns:
             bool: True, wenn der Alarm abgebrochen wurde, False sonst
         """
-        if self.current_alarm and not self.current_alarm.triggered:
-            self.current_alarm = None
-            self.logger.info("⏰ Alarm abgebrochen")
-            return True
+        with self._cond:
+            if self.current_alarm and not self.current_alarm.triggered:
+                self._discard_current_entry()
+                self.current_alarm = None
+                self._cond.notify()
+                self.logger.info("⏰ Alarm abgebrochen")
+                return True
 
         self.logger.info("⏰ Kein aktiver Alarm zum Abbrechen vorhanden")
         return False
@@ -237,32 +294,34 @@ class Alarm(LoggingMixin):
         self.logger.info("⏰ Alarm-Überwachung gestartet")
 
     def _monitor_alarm(self) -> None:
-        """Überwacht den Alarm und löst ihn aus, wenn der Zeitpunkt erreicht ist."""
-        while self.running:
-            # Prüfe, ob ein Alarm gesetzt ist
-            if self.current_alarm and not self.current_alarm.triggered:
-                now = datetime.datetime.now()
-
-                # Prüfe, ob der Alarm ausgelöst werden soll
-                if now >= self.current_alarm.time:
-                    alarm = self.current_alarm
-                    self.current_alarm.triggered = True
-                    self._start_alarm_thread(alarm)
-
-                    # Warte bis zum nächsten Check
-                    time.sleep(60)  # Prüfe regelmäßig, ob ein neuer Alarm gesetzt wurde
-                else:
-                    # Berechne Wartezeit bis zum Alarm
-                    wait_seconds = (self.current_alarm.time - now).total_seconds()
-                    sleep_time = min(wait_seconds, 60)  # Maximal 1 Minute warten
-                    time.sleep(max(1, sleep_time))  # Mindestens 1 Sekunde warten
-            else:
-                # Kein Alarm gesetzt, prüfe gelegentlich wieder
-                time.sleep(60)
+        """
+        Überwacht den Alarm-Heap und schläft exakt bis zur nächsten Weckzeit.
+
+        Neue oder abgebrochene Alarme wecken den Thread über die Condition.
+        """
+        with self._cond:
+            while self.running:
+                # Abgebrochene Alarme an der Spitze verwerfen
+                while self._heap and self._heap[0][2] is None:
+                    heapq.heappop(self._heap)
+                    self._tombstones -= 1
+
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+
+                wait_seconds = self._heap[0][0] - time.monotonic()
+                if wait_seconds > 0:
+                    self._cond.wait(timeout=wait_seconds)
+                    continue
+
+                _, _, alarm = heapq.heappop(self._heap)
+                alarm.triggered = True
+                self._start_alarm_thread(alarm)
 
     def _start_alarm_thread(self, alarm: AlarmItem) -> None:
-        """Startet einen Thread zur Alarmauslösung."""
-        threading.Thread(target=self._trigger_alarm, args=(alarm,), daemon=True).start()
+        """Übergibt die Alarmauslösung an den wiederverwendbaren Thread-Pool."""
+        self._executor.submit(self._trigger_alarm, alarm)
 
     def _run_async_in_thread(self, coro) -> None:
         """Führt eine asyncio-Coroutine in einem separaten Thread aus."""
@@ -287,14 +346,17 @@ class Alarm(LoggingMixin):
             # Warte die Snooze-Zeit ab
             self._handle_snooze_phase(light_thread)
 
-            # Phase 2: Get-Up Sound
-            self._play_get_up_phase(alarm.get_up_sound_id)
+            if self._stop_event.is_set():
+                self.logger.info("⏰ Alarm während der Snooze-Phase beendet")
+            else:
+                # Phase 2: Get-Up Sound
+                self._play_get_up_phase(alarm.get_up_sound_id)
 
-            self.logger.info("⏰ Alarm abgeschlossen")
+                self.logger.info("⏰ Alarm abgeschlossen")
 
-            # Führe Callback aus, falls vorhanden
-            if alarm.callback:
-                alarm.callback()
+                # Führe Callback aus, falls vorhanden
+                if alarm.callback:
+                    alarm.callback()
 
         except Exception as e:
             self.logger.error(f"❌ Fehler beim Alarm: {e}")
@@ -332,61 +394,58 @@ class Alarm(LoggingMixin):
 
     def _play_wake_up_phase(self, sound_id: str) -> None:
         """Spielt den Wake-Up Sound ab."""
-        duration = self.config.wake_up_duration
-        fade_duration = self.config.fade_out_duration
-
-        self.logger.info(
-            f"🔊 Spiele Wake-Up Sound '{sound_id}' für {duration} Sekunden..."
-        )
-        self.audio_manager.play_loop(sound_id, duration - fade_duration)
-
-        self._handle_fade_out_if_playing()
+        self._play_phase("Wake-Up", sound_id, self.config.wake_up_duration)
 
     def _play_get_up_phase(self, sound_id: str) -> None:
         """Spielt den Get-Up Sound ab."""
-        duration = self.config.get_up_duration
-        fade_duration = self.config.fade_out_duration
+        self._play_phase("Get-Up", sound_id, self.config.get_up_duration)
+
+    def _play_phase(self, label: str, sound_id: str, duration: int) -> None:
+        """
+        Spielt einen Sound im Loop für die Dauer der Phase und blendet ihn aus.
+
+        play_loop kehrt sofort zurück, daher wird hier bis zum Beginn des
+        Fade-Outs gewartet (unterbrechbar beim Shutdown).
+        """
+        play_duration = duration - self.config.fade_out_duration
 
         self.logger.info(
-            f"🔊 Spiele Get-Up Sound '{sound_id}' für {duration} Sekunden..."
+            "🔊 Spiele %s Sound '%s' für %s Sekunden...", label, sound_id, duration
         )
-        self.audio_manager.play_loop(sound_id, duration - fade_duration)
+        if self.audio_manager.play_loop(sound_id, play_duration):
+            self._stop_event.wait(play_duration)
 
         self._handle_fade_out_if_playing()
 
     def _handle_fade_out_if_playing(self) -> None:
-        """Führt Fade-Out durch, wenn Sound noch abgespielt wird."""
-        fade_duration = self.config.fade_out_duration
+        """
+        Führt Fade-Out durch, wenn Sound noch abgespielt wird.
 
-        if self.audio_manager.is_playing():
-            self.audio_manager.fade_out(fade_duration)
-            time.sleep(fade_duration)
+        Der Fade-Out der Strategie blockiert selbst für die Fade-Dauer,
+        ein zusätzliches Warten ist daher nicht nötig.
+        """
+        self.audio_manager.fade_out(self.config.fade_out_duration)
 
     def _handle_snooze_phase(self, light_thread: Optional[threading.Thread]) -> None:
         """Behandelt die Snooze-Phase zwischen Wake-Up und Get-Up."""
         snooze_duration = self.config.snooze_duration
         self.logger.info(f"💤 Snooze für {snooze_duration} Sekunden...")
 
-        if light_thread:
-            self._wait_for_light_thread(light_thread, snooze_duration)
-        else:
-            time.sleep(snooze_duration)
+        if not light_thread:
+            self._stop_event.wait(snooze_duration)
+            return
 
-    def _wait_for_light_thread(
-        self, light_thread: threading.Thread, max_wait_time: int
-    ) -> None:
-        """Wartet auf den Lichtwecker-Thread mit Timeout."""
-        remaining_time = max_wait_time
-        while light_thread.is_alive() and remaining_time > 0:
-            sleep_time = min(remaining_time, 1)
-            time.sleep(sleep_time)
-            remaining_time -= sleep_time
+        # join() wäre beim Shutdown nicht unterbrechbar, daher in Scheiben auf
+        # das Stop-Event warten, solange der Lichtwecker noch läuft
+        deadline = time.monotonic() + snooze_duration
+        while light_thread.is_alive():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._stop_event.wait(min(remaining, 1.0)):
+                break
 
     def _handle_alarm_error(self) -> None:
         """Behandelt Fehler bei der Alarmauslösung."""
-        fade_out(self.config.fade_out_duration)
-        time.sleep(self.config.fade_out_duration)
-        stop()
+        self.audio_manager.fade_out(self.config.fade_out_duration)
 
     async def _start_light_alarm(self, scene_name: str, duration: int) -> None:
         try:
@@ -398,11 +457,12 @@ class Alarm(LoggingMixin):
                 )
 
                 # Warte, bis der Sonnenaufgang abgeschlossen ist
-                while (
-                    self.light_controller.running_sunrise
-                    and not self.light_controller.running_sunrise.done()
-                ):
-                    await asyncio.sleep(1)
+                running_sunrise = self.light_controller.running_sunrise
+                if running_sunrise:
+                    try:
+                        await running_sunrise
+                    except asyncio.CancelledError:
+                        pass
 
                 self.logger.info("💡 Lichtwecker abgeschlossen")
         except Exception as e:
@@ -410,17 +470,22 @@ class Alarm(LoggingMixin):
 
     def shutdown(self) -> None:
         """Beendet den Alarm-Manager und stoppt alle laufenden Sounds."""
-        self.running = False
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+
+        self._stop_event.set()
+
         if self.alarm_thread:
             self.alarm_thread.join(timeout=1.0)
 
-        fade_out(self.config.fade_out_duration)
-        time.sleep(self.config.fade_out_duration + 0.5)
-        stop()
+        self._executor.shutdown(wait=False)
+
+        self.audio_manager.fade_out(self.config.fade_out_duration)
 
         # Stoppe auch den Lichtwecker, falls aktiv
         if self.light_controller and self.light_controller.running_sunrise:
-            asyncio.run(self.light_controller.stop_sunrise())
+            self.light_controller.stop_sunrise()
 
         self.logger.info("⏰ Alarm-System heruntergefahren")
 
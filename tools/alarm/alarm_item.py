@@ -1,9 +1,21 @@
 # tools/alarm/alarm_item.py
 from datetime import datetime
+from time import monotonic
 from typing import Optional, Callable, Dict, Any
 
 
 class AlarmItem:
+    __slots__ = (
+        "id",
+        "time",
+        "wake_sound_id",
+        "get_up_sound_id",
+        "callback",
+        "extra",
+        "monotonic_deadline",
+        "triggered",
+    )
+
     def __init__(
         self,
         id: int,
@@ -14,7 +26,9 @@ class AlarmItem:
         extra: Optional[Dict[str, Any]] = None,
     ):
         self.id = id
-        self.time = time
+        self.time = time  # Nur für die Anzeige
+        # Monotone Weckzeit für Vergleiche, unabhängig von Uhrzeitsprüngen/DST
+        self.monotonic_deadline = monotonic() + (time - datetime.now()).total_seconds()
         self.wake_sound_id = wake_sound_id
         self.get_up_sound_id = get_up_sound_id
         self.callback = callback
@@ -23,6 +23,12 @@ audio_manager = WorkflowAudioResponseManager(
     category="light_responses",
 )
 
+# Aktion -> (Controller-Methode, Erfolgsmeldung), ein Dict-Lookup statt if/elif
+LIGHT_ACTIONS = {
+    "on": (hue_controller.turn_on, LIGHT_ON_SUCCESS),
+    "off": (hue_controller.turn_off, LIGHT_OFF_SUCCESS),
+}
+
 def run_async(coro):
     return asyncio.run(coro)
 
@@ -89,17 +95,16 @@ def toggle_hue_lights(action: str, fade_duration: float = 2.0):
         fade_duration: Fade-Dauer in Sekunden (optional, Standard: 2.0)
     """
     try:
-        if action.lower() == "on":
-            run_async(hue_controller.turn_on())
-            return audio_manager.respond_with_audio(LIGHT_ON_SUCCESS)
-        elif action.lower() == "off":
-            run_async(hue_controller.turn_off())
-            return audio_manager.respond_with_audio(LIGHT_OFF_SUCCESS)
-        else:
+        handler = LIGHT_ACTIONS.get(action.lower())
+        if handler is None:
             error_msg = (
                 f"Ungültige Aktion: '{action}'. Bitte 'on' oder 'off' verwenden."
             )
             return audio_manager.respond_with_audio(error_msg)
+
+        switch, success_msg = handler
+        run_async(switch())
+        return audio_manager.respond_with_audio(success_msg)
     except Exception as e:
         error_msg = f"Fehler beim Schalten der Lichter: {str(e)}"
         return audio_manager.respond_with_audio(error_msg)
@@ -141,6 +146,18 @@ def set_hue_brightness(percent: int):
         return audio_manager.respond_with_audio(error_msg)
 
 
+def prewarm_hue_responses():
+    """Erzeugt die festen Antworten der Licht-Tools vorab; Aufruf beim Start."""
+    audio_manager.prewarm(
+        [
+            SCENE_NEXT_SUCCESS,
+            SCENE_PREVIOUS_SUCCESS,
+            LIGHT_ON_SUCCESS,
+            LIGHT_OFF_SUCCESS,
+        ]
+    )
+
+
 def get_hue_tools():
     return [
         list_hue_scenes,
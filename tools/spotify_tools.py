@@ -29,6 +29,20 @@ audio_manager = WorkflowAudioResponseManager(
     category="spotify_responses",
 )
 
+# Aktion -> (Controller-Methode, Erfolgsmeldung, Fehlermeldung)
+PLAYBACK_ACTIONS = {
+    "pause": (
+        spotify_playback_controller.pause_playback,
+        PLAYBACK_PAUSED,
+        "Konnte Wiedergabe nicht pausieren.",
+    ),
+    "resume": (
+        spotify_playback_controller.resume_playback,
+        PLAYBACK_RESUMED,
+        "Konnte Wiedergabe nicht fortsetzen.",
+    ),
+}
+
 @tool
 async def spotify_set_volume(volume: int) -> str:
     """Ändert die Lautstärke des aktuellen Spotify-Players auf einen bestimmten Wert.
@@ -56,15 +70,14 @@ async def spotify_playback_control(action: Literal["pause", "resume"]) -> str:
         action: "pause" zum Pausieren oder "resume" zum Fortsetzen der Wiedergabe
     """
     try:
-        if action == "pause":
-            result = spotify_playback_controller.pause_playback()
-            return audio_manager.respond_with_audio(PLAYBACK_PAUSED) if result else "Konnte Wiedergabe nicht pausieren."
-        elif action == "resume":
-            result = spotify_playback_controller.resume_playback()
-            return audio_manager.respond_with_audio(PLAYBACK_RESUMED) if result else "Konnte Wiedergabe nicht fortsetzen."
-        else:
+        handler = PLAYBACK_ACTIONS.get(action)
+        if handler is None:
             response = PLAYBACK_CONTROL_ERROR.format(action=action)
             return audio_manager.respond_with_audio(response)
+
+        control, success_msg, failure_msg = handler
+        result = control()
+        return audio_manager.respond_with_audio(success_msg) if result else failure_msg
     except Exception as e:
         error_msg = f"Fehler bei der Wiedergabesteuerung: {str(e)}"
         return error_msg
@@ -168,6 +181,20 @@ async def spotify_switch_device(device_name: str) -> str:
         return error_msg
 
 
+def prewarm_spotify_responses():
+    """Erzeugt die festen Antworten der Spotify-Tools vorab; Aufruf beim Start."""
+    audio_manager.prewarm(
+        [
+            VOLUME_ERROR_RANGE,
+            PLAYBACK_PAUSED,
+            PLAYBACK_RESUMED,
+            NEXT_TRACK_SUCCESS,
+            PREV_TRACK_SUCCESS,
+            DEVICES_EMPTY,
+        ]
+    )
+
+
 def get_spotify_tools():
     return [
         spotify_set_volume,
@@ -0,0 +1,54 @@
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUKCache(Generic[K, V]):
+    """
+    Thread-sicherer LRU-K-Cache: verdrängt wird der Eintrag, dessen k-letzter
+    Zugriff am längsten zurückliegt. Einträge mit weniger als k Zugriffen
+    gehen zuerst, sodass einmalige lange Texte wiederkehrende kurze
+    Antworten nicht aus dem Cache schieben.
+    """
+
+    def __init__(self, capacity: int = 256, k: int = 2):
+        self.capacity = capacity
+        self.k = k
+        self._values: Dict[K, V] = {}
+        self._history: Dict[K, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            value = self._values.get(key)
+            if value is not None:
+                self._history[key].append(time.monotonic())
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        with self._lock:
+            if key not in self._values and len(self._values) >= self.capacity:
+                self._evict()
+
+            self._values[key] = value
+            history = self._history.setdefault(key, deque(maxlen=self.k))
+            history.append(time.monotonic())
+
+    def discard(self, key: K) -> None:
+        with self._lock:
+            self._values.pop(key, None)
+            self._history.pop(key, None)
+
+    def _evict(self) -> None:
+        victim = min(self._history, key=self._eviction_rank)
+        del self._values[victim]
+        del self._history[victim]
+
+    def _eviction_rank(self, key: K) -> Tuple[int, float]:
+        history = self._history[key]
+        # Zu selten genutzte Einträge zuerst, danach nach k-letztem Zugriff
+        return (len(history) >= self.k, history[0])
@@ -0,0 +1,42 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-sicherer Token-Bucket zur Begrenzung von API-Aufrufen pro Minute.
+    Erlaubt kurze Spitzen bis zur Größe von burst und blockiert danach, bis
+    wieder ein Token nachgefüllt ist.
+    """
+
+    def __init__(self, rate_per_min: float = 60, burst: int = 5):
+        self._condition = threading.Condition()
+        self.configure_rate(rate_per_min, burst)
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+
+    def configure_rate(self, rate_per_min: float, burst: int = None) -> None:
+        """Passt die Rate zur Laufzeit an, z. B. an das gebuchte API-Kontingent."""
+        with self._condition:
+            self.rate_per_sec = rate_per_min / 60.0
+            if burst is not None:
+                self.burst = burst
+            self._condition.notify_all()
+
+    def acquire(self) -> None:
+        """Entnimmt ein Token und wartet, falls der Bucket leer ist."""
+        with self._condition:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait_time = (1 - self._tokens) / self.rate_per_sec
+                self._condition.wait(wait_time)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate_per_sec)